@@ -1,17 +1,129 @@
 """
 Story generation using LLMs and vector databases.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+from collections import OrderedDict
 from ..data.vector_store import KantoKnowledgeBase
 from ..utils.config import Config
 from ..utils.logger import setup_logger
 from ..core.progression import ProgressionManager
-from .prompts import get_narrator_prompt, get_choice_prompt, get_memory_extraction_prompt
-from .providers import get_llm_provider, get_embedder_provider
+from langchain.schema import SystemMessage, HumanMessage
+from .prompts import (
+    NARRATOR_SYSTEM_TEXT, NARRATOR_HUMAN_TEMPLATE,
+    CHOICE_SYSTEM_TEXT, CHOICE_HUMAN_TEMPLATE,
+    MEMORY_EXTRACTION_SYSTEM_TEXT, MEMORY_EXTRACTION_HUMAN_TEMPLATE
+)
+from .providers import build_llm, build_embedder
+import asyncio
+import hashlib
 import json
+import re
+import threading
 
 logger = setup_logger(__name__)
 
+# LLM responses keyed by (model, prompt hash), shared by every generator so
+# a repeated prompt (re-roll, revisited location) skips the LLM round-trip
+_RESPONSE_CACHE_SIZE = 512
+_response_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Memory tags in the format [Memory: type] ... [End Memory]
+_MEMORY_RE = re.compile(r'\[Memory:\s*(\w+)\]\s*(.*?)\s*\[End Memory\]', re.DOTALL | re.IGNORECASE)
+# Decodes one JSON value starting at an offset, nested objects included
+_JSON_DECODER = json.JSONDecoder()
+# Sentence boundaries for the unstructured memory fallback
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+# Words that mark a sentence as worth remembering, and the typed subsets
+_MEMORY_INDICATORS = (
+    "promise", "promised", "commitment", "vow",
+    "relationship", "friendship", "rivalry",
+    "event", "happened", "occurred", "discovered",
+    "location", "place", "area", "town", "city"
+)
+_PROMISE_WORDS = ("promise", "promised", "commitment")
+_RELATIONSHIP_WORDS = ("relationship", "friendship", "rivalry")
+_LOCATION_WORDS = ("location", "place", "area", "town", "city")
+
+# Bullet and numbering markers for plain-text choices
+_CHOICE_MARKERS = ('-', '*', '•', '1.', '2.', '3.', '4.')
+_CHOICE_PREFIXES = ('- ', '* ', '• ', '1. ', '2. ', '3. ', '4. ')
+
+# Anime-style personality keywords; each distinct keyword found adds 0.1
+_TRAIT_KEYWORDS = {
+    "compassion": frozenset(["help", "care", "comfort", "protect", "save", "understand", "empathize", "kind", "gentle"]),
+    "courage": frozenset(["brave", "courage", "bold", "dare", "risk", "challenge", "face", "confront", "stand up"]),
+    "curiosity": frozenset(["curious", "explore", "investigate", "discover", "learn", "study", "examine", "search", "wonder"]),
+    "friendship": frozenset(["friend", "bond", "trust", "support", "together", "teamwork", "loyal", "faithful", "care"]),
+    "determination": frozenset(["determined", "persist", "never give up", "continue", "keep going", "endure", "overcome", "try"])
+}
+
+# Anime-style context bonuses: (trigger words, trait bonuses if any trigger appears)
+_CONTEXT_BONUSES = (
+    # Compassionate choices that help others
+    (frozenset(["help", "save", "protect", "comfort", "understand"]), {"compassion": 0.2, "friendship": 0.1}),
+    # Courageous choices that face challenges
+    (frozenset(["face", "challenge", "confront", "stand up", "brave"]), {"courage": 0.2, "determination": 0.1}),
+    # Curious choices that explore and learn
+    (frozenset(["explore", "investigate", "discover", "learn", "search"]), {"curiosity": 0.2}),
+    # Friendship-focused choices
+    (frozenset(["friend", "bond", "together", "teamwork", "trust"]), {"friendship": 0.2, "compassion": 0.1}),
+    # Determined choices that persist
+    (frozenset(["try", "continue", "persist", "never give up", "keep going"]), {"determination": 0.2, "courage": 0.1})
+)
+
+# Every distinct keyword, so a choice is scanned once per keyword
+_EFFECT_KEYWORDS = frozenset().union(
+    *_TRAIT_KEYWORDS.values(), *(triggers for triggers, _ in _CONTEXT_BONUSES)
+)
+
+# Rough characters per token for budgeting prompt fields; exact counts
+# would need the serving model's own tokenizer
+_CHARS_PER_TOKEN = 4
+
+# Token budget for each context field in the narrator prompt
+_NARRATOR_FIELD_BUDGETS = {
+    "kanto_knowledge": 512,
+    "story_summary": 256,
+    "current_relationships": 128,
+    "active_promises": 128,
+    "recent_discoveries": 128,
+    "character_growth": 128,
+    "location_context": 256
+}
+
+# Token budget for the recent events list; the oldest events are dropped first
+_RECENT_EVENTS_BUDGET = 256
+
+def _trim(value: Any, max_tokens: int) -> str:
+    """Render a context field as text capped at roughly max_tokens."""
+    if isinstance(value, list):
+        value = "\n".join(
+            item.get("content", "") if isinstance(item, dict) else str(item)
+            for item in value
+        )
+    else:
+        value = str(value)
+    
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(value) <= max_chars:
+        return value
+    # Cut at a word boundary so the model doesn't see half a word
+    return value[:max_chars].rsplit(" ", 1)[0] + "..."
+
+def _recent_within_budget(events: List[str], max_tokens: int) -> List[str]:
+    """Keep the most recent events that fit in roughly max_tokens."""
+    remaining = max_tokens * _CHARS_PER_TOKEN
+    kept = []
+    for event in reversed(events):
+        remaining -= len(event)
+        if remaining < 0:
+            break
+        kept.append(event)
+    kept.reverse()
+    return kept
+
 class StoryGenerator:
     def __init__(self):
         """Initialize the story generator."""
@@ -20,66 +132,53 @@ class StoryGenerator:
         
         # Initialize LLM
         llm_config = self.config.get("ai.llm")
-        self.llm = get_llm_provider(llm_config["provider"]).get_llm(llm_config)
+        self.llm = build_llm(llm_config)
+        self.model_name = llm_config.get("model", "")
         
         # Initialize embedder
         embedder_config = self.config.get("ai.embedder")
-        self.embedder = get_embedder_provider(embedder_config["provider"]).get_embedder(embedder_config)
+        self.embedder = build_embedder(embedder_config)
         
-        # Load prompts
-        self.narrator_prompt = get_narrator_prompt()
-        self.choice_prompt = get_choice_prompt()
-        self.memory_extraction_prompt = get_memory_extraction_prompt()
+        # Load prompts; the system messages never change, so they are built
+        # once and only the human message is formatted per call
+        self.narrator_system = SystemMessage(content=NARRATOR_SYSTEM_TEXT)
+        self.choice_system = SystemMessage(content=CHOICE_SYSTEM_TEXT)
+        self.memory_extraction_system = SystemMessage(content=MEMORY_EXTRACTION_SYSTEM_TEXT)
 
-    def generate_narrative(self,
-                          location: str,
-                          personality: Dict[str, float],
-                          recent_events: List[str],
-                          progression: ProgressionManager) -> Dict[str, Any]:
-        """Generate a narrative segment based on current context."""
-        # Get relevant Kanto knowledge
-        location_info = self.knowledge_base.get_location_info(location)
-        story_context = self.knowledge_base.get_story_context(
-            f"Events in {location} involving {', '.join(recent_events)}"
-        )
-        
-        # Get comprehensive story context (optimized for LLM)
-        comprehensive_context = progression.get_comprehensive_story_context(location)
+    async def generate_narrative(self,
+                                location: str,
+                                personality: Dict[str, float],
+                                recent_events: List[str],
+                                progression: ProgressionManager,
+                                deep_memory_analysis: bool = False) -> Dict[str, Any]:
+        """Generate a narrative segment based on current context.
         
+        Memories are parsed from the [Memory: type] blocks in the narrative
+        itself; deep_memory_analysis runs a separate extraction call instead.
+        """
         # Generate narrative using LLM
-        response = self.llm.invoke(
-            self.narrator_prompt.format_messages(
-                location=location,
-                personality=personality,
-                recent_events=recent_events,
-                kanto_knowledge=story_context,
-                story_summary=comprehensive_context["story_summary"],
-                current_relationships=comprehensive_context["current_relationships"],
-                active_promises=comprehensive_context["active_promises"],
-                recent_discoveries=comprehensive_context["recent_discoveries"],
-                character_growth=comprehensive_context["character_growth"],
-                location_context=comprehensive_context["location_context"]
-            )
+        narrative = await self._invoke(
+            await self._narrator_messages(location, personality, recent_events, progression)
         )
         
         # Extract new memories from the narrative
-        memory_response = self.llm.invoke(
-            self.memory_extraction_prompt.format_messages(
-                narrative=response.content
-            )
-        )
+        if deep_memory_analysis:
+            memory_content = await self._invoke([
+                self.memory_extraction_system,
+                HumanMessage(content=MEMORY_EXTRACTION_HUMAN_TEMPLATE.format(
+                    narrative=narrative
+                ))
+            ])
+        else:
+            memory_content = narrative
         
         # Parse and add new memories
-        new_memories = self._parse_memories(memory_response.content)
+        new_memories = self._parse_memories(memory_content)
         for memory in new_memories:
-            progression.add_memory(
-                memory_type=memory["type"],
-                content=memory["description"],
-                metadata=memory.get("metadata")
-            )
+            self._add_memory(progression, memory)
         
         return {
-            "narrative": response.content,
+            "narrative": narrative,
             "metadata": {
                 "location": location,
                 "personality": personality,
@@ -88,49 +187,127 @@ class StoryGenerator:
             }
         }
 
-    def generate_choices(self,
-                        current_situation: str,
-                        personality: Dict[str, float],
-                        progression: ProgressionManager) -> List[Dict[str, Any]]:
+    async def _narrator_messages(self,
+                                 location: str,
+                                 personality: Dict[str, float],
+                                 recent_events: List[str],
+                                 progression: ProgressionManager) -> List[Any]:
+        """Gather the story context and build the narrator prompt."""
+        # Gather Kanto knowledge and the comprehensive story context
+        # (optimized for LLM) concurrently; the lookups are independent
+        location_info, story_context, comprehensive_context = await asyncio.gather(
+            asyncio.to_thread(self.knowledge_base.get_location_info, location),
+            asyncio.to_thread(
+                self.knowledge_base.get_story_context,
+                # Sorted so the same events in another order hit the embedding cache
+                f"Events in {location} involving {', '.join(sorted(recent_events))}"
+            ),
+            asyncio.to_thread(progression.get_comprehensive_story_context, location)
+        )
+        
+        # Cap every context field so prefill stays proportional to what
+        # the narrator actually uses
+        context_fields = {
+            field: _trim(
+                story_context if field == "kanto_knowledge" else comprehensive_context[field],
+                max_tokens
+            )
+            for field, max_tokens in _NARRATOR_FIELD_BUDGETS.items()
+        }
+        
+        return [
+            self.narrator_system,
+            HumanMessage(content=NARRATOR_HUMAN_TEMPLATE.format(
+                location=location,
+                personality=personality,
+                recent_events=_recent_within_budget(recent_events, _RECENT_EVENTS_BUDGET),
+                **context_fields
+            ))
+        ]
+
+    def _add_memory(self, progression: ProgressionManager, memory: Dict[str, Any]) -> None:
+        """Record a parsed memory in the player's progression."""
+        progression.add_memory(
+            memory_type=memory["type"],
+            content=memory["description"],
+            metadata=memory.get("metadata")
+        )
+
+    async def generate_choices(self,
+                              current_situation: str,
+                              personality: Dict[str, float],
+                              progression: ProgressionManager) -> List[Dict[str, Any]]:
         """Generate choices based on current situation and story context."""
-        # Get relevant context
-        story_context = self.knowledge_base.get_story_context(current_situation)
-        story_memories = progression.get_story_context()
+        # Get relevant context concurrently
+        story_context, story_memories = await asyncio.gather(
+            asyncio.to_thread(self.knowledge_base.get_story_context, current_situation),
+            asyncio.to_thread(progression.get_story_context)
+        )
         
         # Generate choices using LLM
-        response = self.llm.invoke(
-            self.choice_prompt.format_messages(
+        content = await self._invoke([
+            self.choice_system,
+            HumanMessage(content=CHOICE_HUMAN_TEMPLATE.format(
                 current_situation=current_situation,
                 personality=personality,
                 kanto_knowledge=story_context,
                 story_memories=story_memories
-            )
-        )
+            ))
+        ])
         
         # Parse choices from LLM response
-        choices = self._parse_choices(response.content)
+        choices = self._parse_choices(content)
         
         # Add any new memories from choices
         for choice in choices:
             if choice.get("new_memory") is not None:
-                progression.add_memory(
-                    memory_type=choice["new_memory"]["type"],
-                    content=choice["new_memory"]["description"],
-                    metadata=choice["new_memory"].get("metadata")
-                )
+                self._add_memory(progression, choice["new_memory"])
         
         return choices
 
+    async def _invoke(self, messages: List[Any]) -> str:
+        """Invoke the LLM, reusing the response to an identical earlier prompt."""
+        key = self._cache_key(messages)
+        content = self._cached_response(key)
+        if content is not None:
+            return content
+        
+        # The local provider only overrides the sync invoke, so run it in a
+        # worker thread rather than relying on ainvoke
+        content = (await asyncio.to_thread(self.llm.invoke, messages)).content
+        
+        self._cache_response(key, content)
+        return content
+
+    def _cache_key(self, messages: List[Any]) -> Tuple[str, str]:
+        """Key a prompt by model and a hash of its messages."""
+        prompt_hash = hashlib.blake2b(
+            json.dumps([(m.type, m.content) for m in messages]).encode(),
+            digest_size=16
+        ).hexdigest()
+        return (self.model_name, prompt_hash)
+
+    def _cached_response(self, key: Tuple[str, str]) -> Optional[str]:
+        """Get a cached response, marking it as recently used."""
+        with _response_cache_lock:
+            content = _response_cache.get(key)
+            if content is not None:
+                _response_cache.move_to_end(key)
+            return content
+
+    def _cache_response(self, key: Tuple[str, str], content: str) -> None:
+        """Cache a response, evicting the least recently used one if full."""
+        with _response_cache_lock:
+            _response_cache[key] = content
+            if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+
     def _parse_memories(self, content: str) -> List[Dict[str, Any]]:
         """Parse memories from LLM response."""
         memories = []
         
         # Look for memory tags in the format [Memory: type] ... [End Memory]
-        import re
-        memory_pattern = r'\[Memory:\s*(\w+)\]\s*(.*?)\s*\[End Memory\]'
-        matches = re.findall(memory_pattern, content, re.DOTALL | re.IGNORECASE)
-        
-        for memory_type, description in matches:
+        for memory_type, description in _MEMORY_RE.findall(content):
             memory = {
                 "type": memory_type.strip().lower(),
                 "description": description.strip(),
@@ -140,25 +317,18 @@ class StoryGenerator:
         
         # If no structured memories found, try to extract from general text
         if not memories:
-            # Look for potential memory indicators
-            memory_indicators = [
-                "promise", "promised", "commitment", "vow",
-                "relationship", "friendship", "rivalry",
-                "event", "happened", "occurred", "discovered",
-                "location", "place", "area", "town", "city"
-            ]
-            
-            sentences = content.split('.')
-            for sentence in sentences:
+            for sentence in _SENTENCE_SPLIT_RE.split(content):
                 sentence = sentence.strip()
-                if any(indicator in sentence.lower() for indicator in memory_indicators):
+                sentence_lower = sentence.lower()
+                # Look for potential memory indicators
+                if any(indicator in sentence_lower for indicator in _MEMORY_INDICATORS):
                     # Determine memory type based on content
                     memory_type = "event"  # default
-                    if any(word in sentence.lower() for word in ["promise", "promised", "commitment"]):
+                    if any(word in sentence_lower for word in _PROMISE_WORDS):
                         memory_type = "promise"
-                    elif any(word in sentence.lower() for word in ["relationship", "friendship", "rivalry"]):
+                    elif any(word in sentence_lower for word in _RELATIONSHIP_WORDS):
                         memory_type = "relationship"
-                    elif any(word in sentence.lower() for word in ["location", "place", "area", "town", "city"]):
+                    elif any(word in sentence_lower for word in _LOCATION_WORDS):
                         memory_type = "location"
                     
                     memory = {
@@ -174,27 +344,26 @@ class StoryGenerator:
         """Parse choices from LLM response."""
         choices = []
         
-        # Try to parse structured JSON first
-        try:
-            # Look for JSON-like structure in the response
-            import re
-            json_pattern = r'\{[^{}]*"text"[^{}]*\}'
-            json_matches = re.findall(json_pattern, content)
+        # Try to parse structured JSON first, decoding each object in one
+        # pass from its opening brace so nested effects/new_memory survive
+        start = content.find("{")
+        while start != -1:
+            try:
+                choice_data, end = _JSON_DECODER.raw_decode(content, start)
+            except json.JSONDecodeError:
+                choice_data, end = None, start + 1
             
-            for json_str in json_matches:
-                try:
-                    choice_data = json.loads(json_str)
-                    if "text" in choice_data:
-                        choice = {
-                            "text": choice_data["text"],
-                            "effects": choice_data.get("effects", {}),
-                            "new_memory": choice_data.get("new_memory")
-                        }
-                        choices.append(choice)
-                except json.JSONDecodeError:
-                    continue
-        except Exception:
-            pass
+            if isinstance(choice_data, dict) and "text" in choice_data:
+                choice = {
+                    "text": choice_data["text"],
+                    "effects": choice_data.get("effects", {}),
+                    "new_memory": choice_data.get("new_memory")
+                }
+                choices.append(choice)
+            else:
+                # Not a choice itself; a choice may still be nested inside
+                end = start + 1
+            start = content.find("{", end)
         
         # If no structured choices found, parse from text
         if not choices:
@@ -202,12 +371,12 @@ class StoryGenerator:
             for line in lines:
                 line = line.strip()
                 # Look for choice indicators
-                if (line.startswith(('-', '*', '•', '1.', '2.', '3.', '4.')) and 
+                if (line.startswith(_CHOICE_MARKERS) and 
                     len(line) > 3 and not line.startswith('---')):
                     
                     # Extract choice text
                     choice_text = line
-                    for prefix in ['- ', '* ', '• ', '1. ', '2. ', '3. ', '4. ']:
+                    for prefix in _CHOICE_PREFIXES:
                         if choice_text.startswith(prefix):
                             choice_text = choice_text[len(prefix):]
                             break
@@ -229,20 +398,12 @@ class StoryGenerator:
         """Estimate the effects of a choice on anime-style personality traits."""
         effects = {}
         
-        # Define keywords for each anime-style personality trait
-        trait_keywords = {
-            "compassion": ["help", "care", "comfort", "protect", "save", "understand", "empathize", "kind", "gentle"],
-            "courage": ["brave", "courage", "bold", "dare", "risk", "challenge", "face", "confront", "stand up"],
-            "curiosity": ["curious", "explore", "investigate", "discover", "learn", "study", "examine", "search", "wonder"],
-            "friendship": ["friend", "bond", "trust", "support", "together", "teamwork", "loyal", "faithful", "care"],
-            "determination": ["determined", "persist", "never give up", "continue", "keep going", "endure", "overcome", "try"]
-        }
-        
         choice_lower = choice_text.lower()
+        found = {keyword for keyword in _EFFECT_KEYWORDS if keyword in choice_lower}
         
-        for trait, keywords in trait_keywords.items():
+        for trait, keywords in _TRAIT_KEYWORDS.items():
             # Count how many keywords appear in the choice
-            keyword_count = sum(1 for keyword in keywords if keyword in choice_lower)
+            keyword_count = len(found & keywords)
             
             if keyword_count > 0:
                 # Base effect is 0.1 per keyword, capped at 0.3
@@ -250,31 +411,10 @@ class StoryGenerator:
                 effects[trait] = effect
         
         # Anime-style context-based effects
-        import random
-        
-        # Compassionate choices that help others
-        if any(word in choice_lower for word in ["help", "save", "protect", "comfort", "understand"]):
-            effects["compassion"] = effects.get("compassion", 0) + 0.2
-            effects["friendship"] = effects.get("friendship", 0) + 0.1
-        
-        # Courageous choices that face challenges
-        if any(word in choice_lower for word in ["face", "challenge", "confront", "stand up", "brave"]):
-            effects["courage"] = effects.get("courage", 0) + 0.2
-            effects["determination"] = effects.get("determination", 0) + 0.1
-        
-        # Curious choices that explore and learn
-        if any(word in choice_lower for word in ["explore", "investigate", "discover", "learn", "search"]):
-            effects["curiosity"] = effects.get("curiosity", 0) + 0.2
-        
-        # Friendship-focused choices
-        if any(word in choice_lower for word in ["friend", "bond", "together", "teamwork", "trust"]):
-            effects["friendship"] = effects.get("friendship", 0) + 0.2
-            effects["compassion"] = effects.get("compassion", 0) + 0.1
-        
-        # Determined choices that persist
-        if any(word in choice_lower for word in ["try", "continue", "persist", "never give up", "keep going"]):
-            effects["determination"] = effects.get("determination", 0) + 0.2
-            effects["courage"] = effects.get("courage", 0) + 0.1
+        for triggers, bonuses in _CONTEXT_BONUSES:
+            if not found.isdisjoint(triggers):
+                for trait, bonus in bonuses.items():
+                    effects[trait] = effects.get(trait, 0) + bonus
         
         # Ensure effects are within bounds
         for trait in effects:
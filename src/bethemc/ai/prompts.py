@@ -2,12 +2,10 @@
 Prompt templates for anime-style story generation.
 """
 from langchain.prompts import ChatPromptTemplate
-from langchain.schema import SystemMessage, HumanMessage
+from langchain.schema import SystemMessage
 
-def get_narrator_prompt() -> ChatPromptTemplate:
-    """Get the prompt template for anime-style narrative generation."""
-    return ChatPromptTemplate.from_messages([
-        SystemMessage(content="""You are a master storyteller creating an immersive Pokémon anime-style adventure in the Kanto region.
+# Narrator instructions, identical on every call
+NARRATOR_SYSTEM_TEXT = """You are a master storyteller creating an immersive Pokémon anime-style adventure in the Kanto region.
         Your role is to create fluid, character-driven stories that focus on friendship, personal growth, and adventure rather than rigid game mechanics.
         
         Anime-Style Guidelines:
@@ -17,7 +15,8 @@ def get_narrator_prompt() -> ChatPromptTemplate:
         4. Use natural, flowing dialogue that feels like the anime
         5. Include moments of wonder, discovery, and emotional connection
         6. Reference past events and relationships when relevant
-        7. Mark important character moments using [Memory: Type] tags
+        7. Mark every important character moment with a [Memory: Type] ... [End Memory] block;
+           only moments marked this way are remembered
         
         Memory Types:
         - friendship: When bonds with Pokémon or characters deepen
@@ -28,9 +27,10 @@ def get_narrator_prompt() -> ChatPromptTemplate:
         Example Memory Format:
         [Memory: friendship]
         Ash and Pikachu's bond grew stronger as they worked together to help a lost Pokémon
-        [End Memory]"""),
-        
-        HumanMessage(content="""Create an anime-style narrative segment based on the following context:
+        [End Memory]"""
+
+# Narrator request, filled in with str.format
+NARRATOR_HUMAN_TEMPLATE = """Create an anime-style narrative segment based on the following context:
         
         Current Location: {location}
         Player's Personality: {personality}
@@ -54,13 +54,17 @@ def get_narrator_prompt() -> ChatPromptTemplate:
         
         Generate a vivid, character-driven description that feels like a Pokémon anime episode.
         Focus on relationships, emotions, and adventure rather than game mechanics.
-        Mark any important character moments using the [Memory: Type] format.""")
-    ])
+        Mark any important character moments using [Memory: Type] ... [End Memory] blocks."""
 
-def get_choice_prompt() -> ChatPromptTemplate:
-    """Get the prompt template for anime-style choice generation."""
+def get_narrator_prompt() -> ChatPromptTemplate:
+    """Get the prompt template for anime-style narrative generation."""
     return ChatPromptTemplate.from_messages([
-        SystemMessage(content="""You are a choice designer for a Pokémon anime-style adventure.
+        SystemMessage(content=NARRATOR_SYSTEM_TEXT),
+        ("human", NARRATOR_HUMAN_TEMPLATE)
+    ])
+
+# Choice designer instructions, identical on every call
+CHOICE_SYSTEM_TEXT = """You are a choice designer for a Pokémon anime-style adventure.
         Create meaningful choices that reflect character development, friendship, and personal growth.
         
         Anime-Style Choice Guidelines:
@@ -92,9 +96,10 @@ def get_choice_prompt() -> ChatPromptTemplate:
                     "key": "value"
                 }
             }
-        }"""),
-        
-        HumanMessage(content="""Design anime-style choices for the following situation:
+        }"""
+
+# Choice designer request, filled in with str.format
+CHOICE_HUMAN_TEMPLATE = """Design anime-style choices for the following situation:
         
         Current Situation: {current_situation}
         Player's Personality: {personality}
@@ -102,13 +107,17 @@ def get_choice_prompt() -> ChatPromptTemplate:
         Story Memories: {story_memories}
         
         Generate 3-4 meaningful choices that focus on character development, friendship, and adventure.
-        Each choice should be in the specified format and may include new memories if appropriate.""")
-    ])
+        Each choice should be in the specified format and may include new memories if appropriate."""
 
-def get_memory_extraction_prompt() -> ChatPromptTemplate:
-    """Get the prompt template for extracting anime-style memories from narrative."""
+def get_choice_prompt() -> ChatPromptTemplate:
+    """Get the prompt template for anime-style choice generation."""
     return ChatPromptTemplate.from_messages([
-        SystemMessage(content="""You are a memory extractor for a Pokémon anime-style adventure.
+        SystemMessage(content=CHOICE_SYSTEM_TEXT),
+        ("human", CHOICE_HUMAN_TEMPLATE)
+    ])
+
+# Memory extractor instructions, identical on every call
+MEMORY_EXTRACTION_SYSTEM_TEXT = """You are a memory extractor for a Pokémon anime-style adventure.
         Your role is to identify and extract important character moments and emotional bonds from the narrative.
         
         Extract the following types of memories:
@@ -124,12 +133,19 @@ def get_memory_extraction_prompt() -> ChatPromptTemplate:
             "metadata": {
                 "relevant_key": "value"
             }
-        }"""),
-        
-        HumanMessage(content="""Extract memories from the following narrative:
+        }"""
+
+# Memory extractor request, filled in with str.format
+MEMORY_EXTRACTION_HUMAN_TEMPLATE = """Extract memories from the following narrative:
         
         {narrative}
         
         Identify any friendship moments, promises, discoveries, or growth experiences.
-        Format them according to the specified structure.""")
+        Format them according to the specified structure."""
+
+def get_memory_extraction_prompt() -> ChatPromptTemplate:
+    """Get the prompt template for extracting anime-style memories from narrative."""
+    return ChatPromptTemplate.from_messages([
+        SystemMessage(content=MEMORY_EXTRACTION_SYSTEM_TEXT),
+        ("human", MEMORY_EXTRACTION_HUMAN_TEMPLATE)
     ]) 
\ No newline at end of file
@@ -2,15 +2,32 @@
 Provider implementations for different LLM and embedder services.
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Hashable, Optional, Tuple
 import os
-from langchain.chat_models import ChatOpenAI
-from langchain.embeddings import OpenAIEmbeddings
-from langchain.embeddings.huggingface import HuggingFaceEmbeddings
-from langchain.llms import Anthropic
+import json
+import queue
+import threading
+import time
+# Backend classes are imported by the provider that uses them, so only the
+# configured backend's SDK is loaded
 from langchain.llms.base import BaseLLM
 from langchain.embeddings.base import Embeddings
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Keep-alive connections to the local model server, shared by every call
+# so each request skips the TCP handshake
+_HTTP = requests.Session()
+_HTTP.mount("http://", HTTPAdapter(pool_maxsize=32))
+_HTTP.mount("https://", HTTPAdapter(pool_maxsize=32))
+
+# Workers for sending a batch of prompts to the local model concurrently
+_GENERATE_POOL = ThreadPoolExecutor(max_workers=8)
 
 class LLMProvider(ABC):
     """Base class for LLM providers."""
@@ -33,6 +50,7 @@ class OpenAIProvider(LLMProvider):
     
     def get_llm(self, config: Dict[str, Any]) -> BaseLLM:
         """Get OpenAI LLM instance."""
+        from langchain.chat_models import ChatOpenAI
         return ChatOpenAI(
             model_name=config["model"],
             temperature=config["temperature"],
@@ -46,6 +64,7 @@ class AnthropicProvider(LLMProvider):
     
     def get_llm(self, config: Dict[str, Any]) -> BaseLLM:
         """Get Anthropic LLM instance."""
+        from langchain.llms import Anthropic
         return Anthropic(
             model=config["model"],
             temperature=config["temperature"],
@@ -58,20 +77,109 @@ class OpenAIEmbedderProvider(EmbedderProvider):
     
     def get_embedder(self, config: Dict[str, Any]) -> Embeddings:
         """Get OpenAI embedder instance."""
+        from langchain.embeddings import OpenAIEmbeddings
         return OpenAIEmbeddings(
             model=config["model"],
             openai_api_base=config.get("api_base"),
             openai_api_key=config.get("api_key") or os.getenv("OPENAI_API_KEY")
         )
 
+class _PendingQuery:
+    """A query waiting for its batch to be embedded."""
+    
+    def __init__(self, text: str):
+        self.text = text
+        self.done = threading.Event()
+        self.result: Optional[List[float]] = None
+        self.error: Optional[BaseException] = None
+
+class BatchingEmbedder(Embeddings):
+    """Embedder that coalesces concurrent queries into batched encode calls."""
+    
+    # Seconds an idle worker waits for a query before it exits
+    IDLE_TIMEOUT = 1.0
+    
+    def __init__(self, embedder: Embeddings, max_batch: int = 64, max_wait_ms: float = 5):
+        self.embedder = embedder
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: "queue.Queue[_PendingQuery]" = queue.Queue()
+        self._worker_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents; a list is already a batch, so it goes straight through."""
+        return self.embedder.embed_documents(texts)
+    
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query together with any others arriving in the same window."""
+        pending = _PendingQuery(text)
+        self._queue.put(pending)
+        self._ensure_worker()
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+    
+    def _ensure_worker(self):
+        """Start the batching worker if it isn't running."""
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+    
+    def _run(self):
+        """Embed queued queries in batches until the queue stays idle."""
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.IDLE_TIMEOUT)]
+            except queue.Empty:
+                # Exit only if nothing was queued since the timeout; a new
+                # query then starts a fresh worker
+                with self._worker_lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            
+            # Collect whatever else arrives within the batching window
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                vectors = self.embedder.embed_documents([pending.text for pending in batch])
+                for pending, vector in zip(batch, vectors):
+                    pending.result = vector
+            except Exception as e:
+                for pending in batch:
+                    pending.error = e
+            for pending in batch:
+                pending.done.set()
+
 class HuggingFaceEmbedderProvider(EmbedderProvider):
     """HuggingFace embedder provider."""
     
     def get_embedder(self, config: Dict[str, Any]) -> Embeddings:
         """Get HuggingFace embedder instance."""
-        return HuggingFaceEmbeddings(
+        from langchain.embeddings.huggingface import HuggingFaceEmbeddings
+        batch_size = config.get("batch_size", 64)
+        embedder = HuggingFaceEmbeddings(
             model_name=config["model"],
-            model_kwargs={"device": config.get("device", "cpu")}
+            model_kwargs={"device": config.get("device", "cpu")},
+            encode_kwargs={"batch_size": batch_size}
+        )
+        # Single queries from concurrent requests share one encode call
+        return BatchingEmbedder(
+            embedder,
+            max_batch=batch_size,
+            max_wait_ms=config.get("max_wait_ms", 5)
         )
 
 class LocalLlamaProvider(LLMProvider):
@@ -82,81 +190,172 @@ class LocalLlamaProvider(LLMProvider):
             model: str
             temperature: float
             max_tokens: int
-            def __init__(self, api_base, model, temperature, max_tokens):
-                super().__init__(api_base=api_base, model=model, temperature=temperature, max_tokens=max_tokens)
+            keep_alive: str
+            def __init__(self, api_base, model, temperature, max_tokens, keep_alive):
+                super().__init__(api_base=api_base, model=model, temperature=temperature, max_tokens=max_tokens, keep_alive=keep_alive)
+            def preload(self):
+                # A request without a prompt only loads the weights, so the
+                # first real turn doesn't pay the cold start
+                response = _HTTP.post(
+                    self.api_base,
+                    json={"model": self.model, "keep_alive": self.keep_alive},
+                    timeout=300
+                )
+                response.raise_for_status()
             def invoke(self, messages):
+                # Read the reply as a stream so the timeout applies between
+                # tokens rather than to the whole generation
+                class Response:
+                    def __init__(self, content):
+                        self.content = content
+                return Response("".join(self.stream(messages)))
+
+            def stream(self, messages):
                 prompt = "\n".join([m.content for m in messages])
+                payload = {
+                    "model": self.model,
+                    "prompt": prompt,
+                    "stream": True,
+                    "keep_alive": self.keep_alive,
+                    "options": {
+                        "temperature": self.temperature,
+                        "num_predict": self.max_tokens
+                    }
+                }
+                # Ollama streams one JSON object per line as tokens decode
+                with _HTTP.post(
+                    self.api_base,
+                    json=payload,
+                    timeout=60,
+                    stream=True
+                ) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if line:
+                            yield json.loads(line).get("response", "")
+
+            def _generate(self, prompts, stop=None, run_manager=None, **kwargs):
+                # Prompts are independent, and a prompt repeated in the batch
+                # is sent once; map keeps the results in order
+                unique = list(dict.fromkeys(prompts))
+                results = dict(zip(unique, _GENERATE_POOL.map(self._generate_one, unique)))
+                return {"generations": [[dict(results[p])] for p in prompts]}
+
+            def _generate_one(self, prompt):
                 payload = {
                     "model": self.model,
                     "prompt": prompt,
                     "stream": False,
+                    "keep_alive": self.keep_alive,
                     "options": {
                         "temperature": self.temperature,
                         "num_predict": self.max_tokens
                     }
                 }
-                response = requests.post(
+                response = _HTTP.post(
                     self.api_base,
                     json=payload,
                     timeout=60
                 )
                 response.raise_for_status()
                 result = response.json()
-                class Response:
-                    def __init__(self, content):
-                        self.content = content
-                return Response(result.get("response", result.get("content", "")))
-
-            def _generate(self, prompts, stop=None, run_manager=None, **kwargs):
-                results = []
-                for prompt in prompts:
-                    payload = {
-                        "model": self.model,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": self.temperature,
-                            "num_predict": self.max_tokens
-                        }
-                    }
-                    response = requests.post(
-                        self.api_base,
-                        json=payload,
-                        timeout=60
-                    )
-                    response.raise_for_status()
-                    result = response.json()
-                    text = result.get("response", result.get("content", ""))
-                    results.append({"text": text})
-                return {"generations": [[r] for r in results]}
+                text = result.get("response", result.get("content", ""))
+                return {"text": text}
 
             @property
             def _llm_type(self):
                 return "local-llama"
-        return LocalLlamaLLM(
+        llm = LocalLlamaLLM(
             api_base=config["api_base"],
             model=config["model"],
             temperature=config["temperature"],
-            max_tokens=config["max_tokens"]
+            max_tokens=config["max_tokens"],
+            keep_alive=config.get("keep_alive", "30m")
         )
+        if config.get("preload", False):
+            try:
+                llm.preload()
+            except requests.RequestException as e:
+                logger.warning(f"Failed to preload model {config['model']}: {e}")
+        return llm
+
+# Providers are stateless factories, so one instance of each is shared
+_LLM_PROVIDERS = {
+    "openai": OpenAIProvider(),
+    "anthropic": AnthropicProvider(),
+    "local": LocalLlamaProvider(),
+}
+_EMBEDDER_PROVIDERS = {
+    "openai": OpenAIEmbedderProvider(),
+    "sentence-transformers": HuggingFaceEmbedderProvider(),
+}
 
 def get_llm_provider(provider_name: str) -> LLMProvider:
     """Get LLM provider by name."""
-    providers = {
-        "openai": OpenAIProvider(),
-        "anthropic": AnthropicProvider(),
-        "local": LocalLlamaProvider(),
-    }
-    if provider_name not in providers:
+    if provider_name not in _LLM_PROVIDERS:
         raise ValueError(f"Unknown LLM provider: {provider_name}")
-    return providers[provider_name]
+    return _LLM_PROVIDERS[provider_name]
 
 def get_embedder_provider(provider_name: str) -> EmbedderProvider:
     """Get embedder provider by name."""
-    providers = {
-        "openai": OpenAIEmbedderProvider(),
-        "sentence-transformers": HuggingFaceEmbedderProvider(),
-    }
-    if provider_name not in providers:
+    if provider_name not in _EMBEDDER_PROVIDERS:
         raise ValueError(f"Unknown embedder provider: {provider_name}")
-    return providers[provider_name] 
\ No newline at end of file
+    return _EMBEDDER_PROVIDERS[provider_name]
+
+# Built LLMs and embedders keyed by their frozen config; there is one
+# entry per distinct config in the config files
+_built_llms: Dict[Hashable, BaseLLM] = {}
+_built_embedders: Dict[Hashable, Embeddings] = {}
+# Guards the dicts only; building runs under a lock per config, so a slow
+# build such as an LLM preload doesn't hold up other configs
+_build_lock = threading.Lock()
+_key_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+
+def _freeze(value: Any) -> Hashable:
+    """Get a hashable form of a config value, including nested lists and dicts."""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(_freeze(item) for item in value)
+    return value
+
+def _get_or_build(kind: str, built: Dict[Hashable, Any], config: Dict[str, Any],
+                  build: Callable[[], Any]) -> Any:
+    """Get the shared instance for a config, building it on first use."""
+    key = _freeze(config)
+    with _build_lock:
+        instance = built.get(key)
+        if instance is not None:
+            return instance
+        key_lock = _key_locks.setdefault((kind, key), threading.Lock())
+    
+    # Concurrent callers with the same config wait here rather than
+    # building it twice
+    with key_lock:
+        with _build_lock:
+            instance = built.get(key)
+        if instance is None:
+            instance = build()
+            with _build_lock:
+                built[key] = instance
+    return instance
+
+def build_llm(config: Dict[str, Any]) -> BaseLLM:
+    """Get the LLM for a config, shared by every caller with the same config."""
+    return _get_or_build(
+        "llm", _built_llms, config,
+        lambda: get_llm_provider(config["provider"]).get_llm(config)
+    )
+
+def build_embedder(config: Dict[str, Any]) -> Embeddings:
+    """Get the embedder for a config, shared by every caller with the same config.
+    
+    Loading a local embedding model is the expensive part of building a
+    knowledge base, so the weights are loaded once per config.
+    """
+    return _get_or_build(
+        "embedder", _built_embedders, config,
+        lambda: get_embedder_provider(config["provider"]).get_embedder(config)
+    )
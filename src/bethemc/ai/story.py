@@ -1,11 +1,17 @@
 """
 Story scene management for the narrative-driven Pokémon adventure.
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from collections import deque
 from dataclasses import dataclass
 from enum import Enum
-import json
+from itertools import islice
 from pathlib import Path
+import sys
+import orjson
+
+# Scenes and choices are slotted where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 class SceneType(Enum):
     DIALOGUE = "dialogue"
@@ -13,14 +19,14 @@ class SceneType(Enum):
     BATTLE = "battle"
     PUZZLE = "puzzle"
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Choice:
     text: str
     next_scene: str
     effects: Dict[str, float]  # Effects on story variables
     requirements: Optional[Dict[str, float]] = None  # Requirements to show this choice
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class Scene:
     id: str
     type: SceneType
@@ -31,12 +37,17 @@ class Scene:
     npc: Optional[str] = None
     requirements: Optional[Dict[str, float]] = None
 
+# Parsed scenes per story directory, with the (file name, mtime) signature
+# they were parsed from; reused while no scene file changes
+_scene_cache: Dict[Path, Tuple[Tuple[Tuple[str, int], ...], Dict[str, Scene]]] = {}
+
 class StoryManager:
-    def __init__(self, story_data_path: str = "data/raw/story"):
+    def __init__(self, story_data_path: str = "data/raw/story", history_cap: int = 1024):
         """Initialize the story manager."""
         self.story_data_path = Path(story_data_path)
         self.current_scene: Optional[Scene] = None
-        self.scene_history: List[str] = []
+        # Only the most recent history_cap scenes are kept
+        self.scene_history: "deque[str]" = deque(maxlen=history_cap)
         self.story_state: Dict[str, float] = {}
         self.scenes: Dict[str, Scene] = {}
         
@@ -45,11 +56,20 @@ class StoryManager:
 
     def _load_story_data(self):
         """Load story scenes from JSON files."""
-        for scene_file in self.story_data_path.glob("*.json"):
-            with open(scene_file, 'r', encoding='utf-8') as f:
-                scene_data = json.load(f)
-                scene = self._create_scene_from_data(scene_data)
-                self.scenes[scene.id] = scene
+        scene_files = sorted(self.story_data_path.glob("*.json"))
+        signature = tuple((path.name, path.stat().st_mtime_ns) for path in scene_files)
+        
+        # Scenes are never modified after loading, so managers can share them
+        key = self.story_data_path.resolve()
+        cached = _scene_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            self.scenes = dict(cached[1])
+            return
+        
+        for scene_file in scene_files:
+            scene = self._create_scene_from_data(orjson.loads(scene_file.read_bytes()))
+            self.scenes[scene.id] = scene
+        _scene_cache[key] = (signature, dict(self.scenes))
 
     def _create_scene_from_data(self, data: Dict) -> Scene:
         """Create a Scene object from JSON data."""
@@ -80,7 +100,8 @@ class StoryManager:
             raise ValueError(f"Starting scene {starting_scene_id} not found")
         
         self.current_scene = self.scenes[starting_scene_id]
-        self.scene_history = [starting_scene_id]
+        self.scene_history.clear()
+        self.scene_history.append(starting_scene_id)
         self.story_state = {}
 
     def get_available_choices(self) -> List[Choice]:
@@ -133,4 +154,8 @@ class StoryManager:
 
     def get_scene_history(self) -> List[str]:
         """Get the history of visited scenes."""
-        return self.scene_history.copy() 
\ No newline at end of file
+        return list(self.scene_history)
+
+    def recent(self, n: int = 10) -> List[str]:
+        """Get the last n visited scenes, oldest first."""
+        return list(islice(self.scene_history, max(0, len(self.scene_history) - n), None)) 
\ No newline at end of file
@@ -2,25 +2,28 @@
 Dynamic story generator using LLM to create personalized Pokémon adventures.
 """
 from typing import List, Dict, Any, Optional
-from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import HumanMessage, SystemMessage
 from bethemc.data.vector_store import KantoKnowledgeBase
 from bethemc.core.progression import ProgressionManager
 from bethemc.utils.config import Config
 from bethemc.utils.logger import setup_logger
-from bethemc.ai.providers import get_llm_provider
+from bethemc.ai.providers import build_llm
 
 logger = setup_logger(__name__)
 
 class StoryGenerator:
-    def __init__(self, config=None):
-        """Initialize the story generator."""
+    def __init__(self, config=None, knowledge_base: Optional[KantoKnowledgeBase] = None):
+        """Initialize the story generator.
+        
+        The generator tracks one player's progression, so it is built per
+        game; the knowledge base holds no player state and can be shared.
+        """
         self.config = config or Config()
-        self.knowledge_base = KantoKnowledgeBase()
-        self.progression = ProgressionManager(self.config)
+        self.knowledge_base = knowledge_base or KantoKnowledgeBase(self.config)
+        self.progression = ProgressionManager(self.config, knowledge_base=self.knowledge_base)
         llm_config = self.config.get("ai.llm")
-        self.llm = get_llm_provider(llm_config["provider"]).get_llm(llm_config)
+        self.llm = build_llm(llm_config)
         self._setup_prompts()
 
     def _setup_prompts(self):
@@ -1,16 +1,78 @@
 """
 Clean story generator implementation.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime
+from secrets import token_hex
+import hashlib
+import re
+import threading
 
 from bethemc.models.core import PersonalityTraits, Choice, NarrativeSegment
-from ..ai.providers import get_llm_provider
+from ..ai.providers import build_llm
 from ..utils.config import Config
 from ..utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# LLM responses keyed by (model, prompt hash), shared by every generator so
+# re-entering a scene with the same context skips the LLM round-trip
+_PROMPT_CACHE_SIZE = 1024
+_prompt_cache: "OrderedDict[Tuple[str, bytes], str]" = OrderedDict()
+_prompt_cache_lock = threading.Lock()
+
+# "Choice X: description (effects: trait: value, ...)" lines, matched
+# anywhere in a response; no part of a match crosses a line break
+_CHOICE_LINE_RE = re.compile(
+    r'^[ \t]*choice[^:\n]*:[ \t]*([^(\n]*)(?:\(([^)\n]*)\))?',
+    re.IGNORECASE | re.MULTILINE
+)
+# trait: value pairs inside the effects
+_EFFECTS_RE = re.compile(r'(\w+)\s*:\s*([0-9]*\.?[0-9]+)')
+
+# Choices offered when the LLM response has none
+_DEFAULT_CHOICE_SPECS = (
+    ("Continue your journey", {}),
+    ("Explore the area", {"curiosity": 0.1}),
+    ("Rest and reflect", {"wisdom": 0.1})
+)
+
+def _default_choices() -> List[Choice]:
+    """Build fresh default choices."""
+    return [
+        Choice(id=token_hex(16), text=text, effects=dict(effects))
+        for text, effects in _DEFAULT_CHOICE_SPECS
+    ]
+
+def _match_choices(text: str) -> List[Choice]:
+    """Build a choice for every "Choice X: ..." line in the text."""
+    choices = []
+    for match in _CHOICE_LINE_RE.finditer(text):
+        effects = {}
+        
+        # Look for effects in parentheses
+        effects_part = match.group(2)
+        if effects_part is not None:
+            _, found, effects_text = effects_part.lower().partition('effects:')
+            if found:
+                effects = _parse_effects(effects_text)
+        
+        choices.append(Choice(id=token_hex(16), text=match.group(1).strip(), effects=effects))
+    return choices
+
+def _parse_effects(effects_text: str) -> Dict[str, float]:
+    """Parse effects from text."""
+    # Look for trait: value patterns; the pattern only matches valid floats
+    return {
+        match.group(1).lower(): float(match.group(2))
+        for match in _EFFECTS_RE.finditer(effects_text)
+    }
+
+def _format_personality(personality: PersonalityTraits) -> str:
+    """Format personality traits for a prompt."""
+    return f"Friendship: {personality.friendship}, Courage: {personality.courage}, Curiosity: {personality.curiosity}, Wisdom: {personality.wisdom}, Determination: {personality.determination}"
+
 class StoryGeneratorV2:
     """Clean implementation of story generation."""
     
@@ -18,7 +80,8 @@ class StoryGeneratorV2:
         """Initialize the story generator."""
         self.config = config
         llm_config = config.get("ai.llm")
-        self.llm = get_llm_provider(llm_config["provider"]).get_llm(llm_config)
+        self.llm = build_llm(llm_config)
+        self.model_name = llm_config.get("model", "")
         self._setup_prompts()
     
     def _setup_prompts(self):
@@ -58,7 +121,7 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
         """Generate a narrative segment."""
         try:
             # Format personality for prompt
-            personality_text = f"Friendship: {personality.friendship}, Courage: {personality.courage}, Curiosity: {personality.curiosity}, Wisdom: {personality.wisdom}, Determination: {personality.determination}"
+            personality_text = _format_personality(personality)
             
             # Format context
             context_text = self._format_context(context)
@@ -71,8 +134,7 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
                 context=context_text
             )
             
-            response = self.llm.invoke([{"role": "user", "content": prompt}])
-            narrative_content = response.content if hasattr(response, 'content') else str(response)
+            narrative_content = self._invoke(prompt)
             
             return NarrativeSegment(
                 content=narrative_content,
@@ -96,7 +158,7 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
         """Generate choices for a situation."""
         try:
             # Format personality for prompt
-            personality_text = f"Friendship: {personality.friendship}, Courage: {personality.courage}, Curiosity: {personality.curiosity}, Wisdom: {personality.wisdom}, Determination: {personality.determination}"
+            personality_text = _format_personality(personality)
             
             # Format context
             context_text = self._format_context(context)
@@ -108,8 +170,7 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
                 context=context_text
             )
             
-            response = self.llm.invoke([{"role": "user", "content": prompt}])
-            response_text = response.content if hasattr(response, 'content') else str(response)
+            response_text = self._invoke(prompt)
             
             # Parse choices
             choices = self._parse_choices(response_text)
@@ -117,11 +178,39 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
             return choices
         except Exception as e:
             logger.error(f"Failed to generate choices: {e}")
-            return [
-                Choice(text="Continue your journey", effects={}),
-                Choice(text="Explore the area", effects={"curiosity": 0.1}),
-                Choice(text="Rest and reflect", effects={"wisdom": 0.1})
-            ]
+            return _default_choices()
+    
+    def _invoke(self, prompt: str) -> str:
+        """Invoke the LLM, reusing the response to an identical earlier prompt."""
+        key = self._cache_key(prompt)
+        content = self._cached_response(key)
+        if content is not None:
+            return content
+        
+        response = self.llm.invoke([{"role": "user", "content": prompt}])
+        content = response.content if hasattr(response, 'content') else str(response)
+        
+        self._cache_response(key, content)
+        return content
+    
+    def _cache_key(self, prompt: str) -> Tuple[str, bytes]:
+        """Key a prompt by model and a hash of its text."""
+        return (self.model_name, hashlib.blake2b(prompt.encode(), digest_size=16).digest())
+    
+    def _cached_response(self, key: Tuple[str, bytes]) -> Optional[str]:
+        """Get a cached response, marking it as recently used."""
+        with _prompt_cache_lock:
+            content = _prompt_cache.get(key)
+            if content is not None:
+                _prompt_cache.move_to_end(key)
+            return content
+    
+    def _cache_response(self, key: Tuple[str, bytes], content: str):
+        """Cache a response, evicting the least recently used one when full."""
+        with _prompt_cache_lock:
+            _prompt_cache[key] = content
+            if len(_prompt_cache) > _PROMPT_CACHE_SIZE:
+                _prompt_cache.popitem(last=False)
     
     def _format_context(self, context: Dict[str, Any]) -> str:
         """Format context for prompts."""
@@ -147,49 +236,5 @@ Format each choice as: "Choice X: [description] (effects: [trait: value, ...])"
     
     def _parse_choices(self, response_text: str) -> List[Choice]:
         """Parse choices from LLM response."""
-        choices = []
-        
-        # Simple parsing - look for lines starting with "Choice"
-        lines = response_text.split('\n')
-        for line in lines:
-            line = line.strip()
-            if line.lower().startswith('choice'):
-                # Extract choice text and effects
-                choice_text = line.split(':', 1)[1].split('(')[0].strip()
-                effects = {}
-                
-                # Look for effects in parentheses
-                if '(' in line and ')' in line:
-                    effects_part = line.split('(')[1].split(')')[0]
-                    if 'effects:' in effects_part.lower():
-                        effects_text = effects_part.split('effects:')[1].strip()
-                        effects = self._parse_effects(effects_text)
-                
-                choices.append(Choice(text=choice_text, effects=effects))
-        
         # If no choices found, create defaults
-        if not choices:
-            choices = [
-                Choice(text="Continue your journey", effects={}),
-                Choice(text="Explore the area", effects={"curiosity": 0.1}),
-                Choice(text="Rest and reflect", effects={"wisdom": 0.1})
-            ]
-        
-        return choices
-    
-    def _parse_effects(self, effects_text: str) -> Dict[str, float]:
-        """Parse effects from text."""
-        effects = {}
-        
-        # Look for trait: value patterns
-        import re
-        pattern = r'(\w+):\s*([0-9.]+)'
-        matches = re.findall(pattern, effects_text)
-        
-        for trait, value in matches:
-            try:
-                effects[trait.lower()] = float(value)
-            except ValueError:
-                continue
-        
-        return effects 
\ No newline at end of file
+        return _match_choices(response_text) or _default_choices()
@@ -3,13 +3,19 @@ Main FastAPI application for BeTheMC.
 """
 from fastapi import FastAPI, Depends, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware import Middleware
 from fastapi.routing import APIRoute
 from typing import Callable, List, Optional, Set, Type
+from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
+import logging
+import os
 import re
+import time
 
 from .routes import router as api_router
 from bethemc.utils.logger import setup_logger
@@ -33,6 +39,14 @@ PUBLIC_PATHS = {
     "/auth/register"
 }
 
+# Origins allowed to call the API from a browser, comma-separated in
+# BETHEMC_CORS_ORIGINS; any origin is allowed unless a deployment lists them
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("BETHEMC_CORS_ORIGINS", "*").split(",")
+    if origin.strip()
+]
+
 class AuthMiddleware:
     """Middleware to handle authentication for all endpoints."""
     
@@ -55,7 +69,7 @@ class AuthMiddleware:
         # Check for Authorization header
         auth_header = request.headers.get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            response = JSONResponse(
+            response = ORJSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Not authenticated"},
                 headers={"WWW-Authenticate": "Bearer"},
@@ -70,7 +84,7 @@ class AuthMiddleware:
             # Attach user info to request state
             request.state.user = payload
         except Exception as e:
-            response = JSONResponse(
+            response = ORJSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Invalid authentication credentials"},
                 headers={"WWW-Authenticate": "Bearer"},
@@ -80,8 +94,86 @@ class AuthMiddleware:
             
         return await self.app(scope, receive, send)
 
+class RequestTimingMiddleware:
+    """Middleware to log how long each request takes, at debug level."""
+    
+    def __init__(self, app):
+        self.app = app
+        
+    async def __call__(self, scope, receive, send):
+        # Plain ASGI, so requests pass straight through when not timed
+        if scope["type"] != "http" or not logger.isEnabledFor(logging.DEBUG):
+            return await self.app(scope, receive, send)
+            
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            logger.debug(
+                "%s %s took %.1f ms",
+                scope["method"], scope["path"], (time.perf_counter() - start) * 1000
+            )
+
 logger = get_logger(__name__)
 
+# Body of the welcome endpoint; it never changes, so it is built once
+WELCOME_PAYLOAD = {
+    "message": "Welcome to BeTheMC - AI Pokémon Adventure",
+    "version": "2.0.0",
+    "docs": "/docs",
+    "redoc": "/redoc",
+    "status": "running",
+    "quick_start": {
+        "start_game": "POST /api/v1/game/start?player_name=YourName",
+        "make_choice": "POST /api/v1/game/choice with player_id and choice_id",
+        "get_state": "GET /api/v1/game/state/{player_id}"
+    }
+}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Connect to the database and warm the models for the app's lifetime."""
+    from ..database import mongodb
+    try:
+        await mongodb.connect()
+        logger.info("Connected to MongoDB")
+    except Exception as e:
+        logger.error(f"Failed to connect to MongoDB: {e}")
+        raise
+    
+    # Load the embedding model and the LLM before the first request
+    from ..ai.providers import build_embedder, build_llm
+    from ..utils.config import Config
+    config = Config()
+    
+    async def warm_embedder():
+        try:
+            # build_embedder is shared per config, so the knowledge bases
+            # reuse these weights; one query warms the encode path
+            embedder = await asyncio.to_thread(build_embedder, config.get("ai.embedder"))
+            await asyncio.to_thread(embedder.embed_query, "warmup")
+            logger.info("Embedding model loaded")
+        except Exception as e:
+            logger.warning(f"Failed to preload embedding model: {e}")
+    
+    async def warm_llm():
+        try:
+            # build_llm is shared per config too; a provider with preload
+            # set loads the model's weights while building it
+            await asyncio.to_thread(build_llm, config.get("ai.llm"))
+            logger.info("LLM loaded")
+        except Exception as e:
+            logger.warning(f"Failed to preload LLM: {e}")
+    
+    # Independent, so the model server loads the LLM while the embedder loads
+    await asyncio.gather(warm_embedder(), warm_llm())
+    
+    try:
+        yield
+    finally:
+        await mongodb.close()
+        logger.info("Closed MongoDB connection")
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
     # Create the app with middleware
@@ -110,6 +202,10 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        # orjson serializes faster than the stdlib encoder and handles
+        # datetimes such as narrative timestamps natively
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
         contact={
             "name": "BeTheMC Development Team",
             "url": "https://github.com/your-repo/bethemc"
@@ -134,17 +230,27 @@ def create_app() -> FastAPI:
         ]
     )
     
-    # Add CORS middleware
+    # Compress responses large enough to benefit, such as game states
+    # with long narratives and memory lists
+    app.add_middleware(GZipMiddleware, minimum_size=1024)
+    
+    # Add authentication middleware
+    app.add_middleware(AuthMiddleware)
+    
+    # Added after the auth middleware so it wraps it: preflights carry no
+    # token, and every response, a 401 included, gets the CORS headers
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=["*"],  # In production, replace with your frontend URL
+        allow_origins=CORS_ORIGINS,
         allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        # Only what the routes use; browsers cache the preflight for a day
+        allow_methods=["GET", "POST"],
+        allow_headers=["Authorization", "Content-Type"],
+        max_age=86400,
     )
     
-    # Add authentication middleware
-    app.add_middleware(AuthMiddleware)
+    # Outermost, so the timing includes the other middleware
+    app.add_middleware(RequestTimingMiddleware)
     
     # Include API routes
     from ..auth.routes import router as auth_router
@@ -167,42 +273,14 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "ok"}
         
-    # Startup event to initialize database connection
-    @app.on_event("startup")
-    async def startup_db_client():
-        from ..database import mongodb
-        try:
-            await mongodb.connect()
-            logger.info("Connected to MongoDB")
-        except Exception as e:
-            logger.error(f"Failed to connect to MongoDB: {e}")
-            raise
-    
-    # Shutdown event to close database connection
-    @app.on_event("shutdown")
-    async def shutdown_db_client():
-        from ..database import mongodb
-        await mongodb.close()
-        logger.info("Closed MongoDB connection")
-        
     @app.get("/",
         summary="Welcome",
         description="Welcome endpoint with API information and links to documentation.",
         tags=["Info"]
     )
     async def root():
-        return {
-            "message": "Welcome to BeTheMC - AI Pokémon Adventure",
-            "version": "2.0.0",
-            "docs": "/docs",
-            "redoc": "/redoc",
-            "status": "running",
-            "quick_start": {
-                "start_game": "POST /api/v1/game/start?player_name=YourName",
-                "make_choice": "POST /api/v1/game/choice with player_id and choice_id",
-                "get_state": "GET /api/v1/game/state/{player_id}"
-            }
-        }
+        # A response object skips FastAPI's per-request encoding of the dict
+        return ORJSONResponse(WELCOME_PAYLOAD)
     
     @app.get(
         "/health",
@@ -226,7 +304,7 @@ app = create_app()
 async def global_exception_handler(request, exc):
     """Global exception handler."""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -235,16 +313,25 @@ async def global_exception_handler(request, exc):
         }
     )
 
-def run_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = True):
-    """Run the FastAPI server."""
-    logger.info(f"Starting BeTheMC API server on {host}:{port}")
+def run_server(host: str = "0.0.0.0", port: int = 8000, reload: bool = True, workers: int = 1):
+    """Run the FastAPI server.
+    
+    Active games live in each process's GameManager.active_games, so a
+    request routed to another worker would not find its game; keep one
+    worker until game state moves to a shared store.
+    """
+    logger.info(f"Starting BeTheMC API server on {host}:{port} with {workers} worker(s)")
     uvicorn.run(
         "bethemc.api.app:app",
         host=host,
         port=port,
         reload=reload,
+        workers=workers,
+        # The LLM-bound routes spend most of their time awaiting I/O; the
+        # default "auto" loop and parser pick uvloop and httptools from
+        # uvicorn[standard], falling back to asyncio where uvloop is missing
         log_level="info"
     )
 
 if __name__ == "__main__":
-    run_server() 
\ No newline at end of file
+    run_server()
\ No newline at end of file
@@ -4,6 +4,7 @@ Dependency injection setup for BeTheMC API.
 from fastapi import Depends
 from typing import Optional, List, Dict, Any
 from datetime import datetime
+from functools import lru_cache
 
 from ..core.interfaces import StoryGenerator, KnowledgeBase, ProgressionTracker, SaveManager, Memory
 from ..ai.story_generator import StoryGenerator as ConcreteStoryGenerator
@@ -105,21 +106,9 @@ class SaveManagerAdapter:
         """Save game data."""
         try:
             # Convert the data back to a GameState object for the save service
-            from ..models.core import GameState, Player, Story, Choice, Memory, GameProgression
+            from ..services.codec import decode_game_state
             
-            player = Player(**data["game_state"]["player"])
-            current_story = Story(**data["game_state"]["current_story"])
-            available_choices = [Choice(**c) for c in data["game_state"]["available_choices"]]
-            memories = [Memory(**m) for m in data["game_state"]["memories"]]
-            progression = GameProgression(**data["game_state"]["progression"])
-            
-            game_state = GameState(
-                player=player,
-                current_story=current_story,
-                available_choices=available_choices,
-                memories=memories,
-                progression=progression
-            )
+            game_state = decode_game_state(data["game_state"])
             
             # Use the save service's async method
             import asyncio
@@ -161,32 +150,39 @@ def get_config() -> Config:
     """Get configuration instance."""
     return Config()
 
+# Connecting to Qdrant and loading the knowledge files is the expensive part
+# of a story generator, and the knowledge base holds no player state
+@lru_cache(maxsize=1)
+def get_kanto_knowledge_base() -> KantoKnowledgeBase:
+    """Get the Kanto knowledge base shared by every request."""
+    return KantoKnowledgeBase(get_config())
+
 def get_story_generator() -> StoryGenerator:
     """Get story generator instance."""
     config = get_config()
-    return ConcreteStoryGenerator(config)
+    return ConcreteStoryGenerator(config, knowledge_base=get_kanto_knowledge_base())
 
 def get_knowledge_base() -> KnowledgeBase:
     """Get knowledge base instance."""
-    config = get_config()
-    kanto_kb = KantoKnowledgeBase(config)
-    return KnowledgeBaseAdapter(kanto_kb)
+    return KnowledgeBaseAdapter(get_kanto_knowledge_base())
 
 def get_progression_tracker() -> ProgressionTracker:
     """Get progression tracker instance."""
     config = get_config()
-    progression_manager = ProgressionManager(config)
+    progression_manager = ProgressionManager(config, knowledge_base=get_kanto_knowledge_base())
     return ProgressionTrackerAdapter(progression_manager)
 
 def get_save_manager() -> SaveManager:
     """Get save manager instance."""
-    save_service = SaveService()
-    return SaveManagerAdapter(save_service)
+    return SaveManagerAdapter(get_save_service())
 
+# The services hold no per-request state, so every request shares one of each
+@lru_cache(maxsize=1)
 def get_game_service() -> GameService:
     """Get game service instance."""
     return GameService()
 
+@lru_cache(maxsize=1)
 def get_save_service() -> SaveService:
     """Get save service instance."""
     return SaveService() 
\ No newline at end of file
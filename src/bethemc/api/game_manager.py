@@ -1,29 +1,36 @@
 """
 Game manager for handling game state and API operations.
 """
-from typing import Dict, List, Optional, Any
-from pathlib import Path
-import json
-from datetime import datetime
+from typing import Dict, Optional, Any
 from fastapi import HTTPException, Depends
 
-from bethemc.core.game import GameLoop
-from bethemc.core.progression import ProgressionManager
-from bethemc.ai.story_generator import StoryGenerator
-from bethemc.utils.config import Config
-from bethemc.utils.logger import setup_logger, get_logger
-from bethemc.models.core import PersonalityTraits, Choice, Memory, NarrativeSegment, GameState, Player, Story, PersonalityTrait, GameProgression
-from bethemc.models.api import (
-    PersonalityTraitsSchema, ChoiceSchema, NarrativeResponseSchema, GameStateSchema,
-    ChoiceRequestSchema, NewGameRequestSchema, SaveGameRequestSchema, LoadGameRequestSchema,
-    CompressedContextResponseSchema, MemoryRequestSchema, APIResponseSchema, GameResponse, ChoiceRequest, ChoiceResponse, SaveRequest, LoadRequest, MemoryRequest, PersonalityRequest
-)
-from bethemc.services.game_service import GameService
+from bethemc.utils.logger import get_logger
+from bethemc.models.core import GameState
+from bethemc.models.api import GameResponse, ChoiceResponse
+from bethemc.services.game_service import GameService, memory_cursor
 from bethemc.services.save_service import SaveService
+from bethemc.services.codec import dump_model
 from .dependencies import get_game_service, get_save_service
 
 logger = get_logger(__name__)
 
+def _game_response(game_state: GameState) -> GameResponse:
+    """Build the API response for a game state.
+
+    The fields come straight from frozen models and FastAPI validates the
+    returned value against the route's response_model, so the response is
+    constructed without a second validation pass.
+    """
+    return GameResponse.model_construct(
+        player_id=game_state.player.id,
+        player_name=game_state.player.name,
+        current_story=dump_model(game_state.current_story),
+        available_choices=[dump_model(choice) for choice in game_state.available_choices],
+        personality_traits=game_state.player.personality_traits,
+        memories=[dump_model(memory) for memory in game_state.memories],
+        game_progress=dump_model(game_state.progression)
+    )
+
 class GameManager:
     """Manages game state and coordinates between services."""
     
@@ -37,39 +44,40 @@ class GameManager:
     async def start_game(self, player_name: str, personality_traits: Optional[Dict[str, int]] = None) -> GameResponse:
         """Start a new game for a player."""
         try:
-            game_state = await self.game_service.start_new_game(player_name, personality_traits)
+            game_state = self.game_service.start_new_game(player_name, personality_traits)
             GameManager.active_games[game_state.player.id] = game_state
             
-            return GameResponse(
-                player_id=game_state.player.id,
-                player_name=game_state.player.name,
-                current_story=game_state.current_story.__dict__,
-                available_choices=[choice.__dict__ for choice in game_state.available_choices],
-                personality_traits=game_state.player.personality_traits,
-                memories=[memory.__dict__ for memory in game_state.memories],
-                game_progress=game_state.progression.__dict__
-            )
+            return _game_response(game_state)
         except Exception as e:
             logger.error(f"Failed to start game: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to start game: {str(e)}")
     
-    async def make_choice(self, player_id: str, choice_id: str) -> ChoiceResponse:
+    async def make_choice(self, player_id: str, choice_id: str, memories_since: Optional[str] = None) -> ChoiceResponse:
         """Process a player's choice and advance the story."""
         try:
             if player_id not in GameManager.active_games:
                 raise HTTPException(status_code=404, detail="Game not found")
             
             game_state = GameManager.active_games[player_id]
-            updated_state = await self.game_service.process_choice(game_state, choice_id)
+            # Checked before the choice is applied, so a stale cursor
+            # doesn't advance the story
+            try:
+                first_new_memory = memory_cursor(game_state.memories, memories_since)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            
+            updated_state = self.game_service.process_choice(game_state, choice_id)
             GameManager.active_games[player_id] = updated_state
             
-            return ChoiceResponse(
+            return ChoiceResponse.model_construct(
                 player_id=updated_state.player.id,
-                current_story=updated_state.current_story.__dict__,
-                available_choices=[choice.__dict__ for choice in updated_state.available_choices],
-                memories=[memory.__dict__ for memory in updated_state.memories],
-                game_progress=updated_state.progression.__dict__
+                current_story=dump_model(updated_state.current_story),
+                available_choices=[dump_model(choice) for choice in updated_state.available_choices],
+                memories=[dump_model(memory) for memory in updated_state.memories[first_new_memory:]],
+                game_progress=dump_model(updated_state.progression)
             )
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Failed to process choice: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to process choice: {str(e)}")
@@ -99,24 +107,18 @@ class GameManager:
             game_state = await self.save_service.load_game(player_id, save_id)
             GameManager.active_games[player_id] = game_state
             
-            return GameResponse(
-                player_id=game_state.player.id,
-                player_name=game_state.player.name,
-                current_story=game_state.current_story.__dict__,
-                available_choices=[choice.__dict__ for choice in game_state.available_choices],
-                personality_traits=game_state.player.personality_traits,
-                memories=[memory.__dict__ for memory in game_state.memories],
-                game_progress=game_state.progression.__dict__
-            )
+            return _game_response(game_state)
         except Exception as e:
             logger.error(f"Failed to load game: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to load game: {str(e)}")
     
-    async def get_saves(self, player_id: str) -> Dict[str, Any]:
-        """Get all saves for a player."""
+    async def get_saves(self, player_id: str, limit: int = 20, after_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get a page of a player's saves, newest first."""
         try:
-            saves = await self.save_service.get_player_saves(player_id)
-            return {"saves": saves}
+            return await self.save_service.get_player_saves_page(player_id, limit, after_id)
+        except ValueError as e:
+            # A stale cursor; the client restarts the listing
+            raise HTTPException(status_code=400, detail=str(e))
         except Exception as e:
             logger.error(f"Failed to get saves: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to get saves: {str(e)}")
@@ -128,12 +130,12 @@ class GameManager:
                 raise HTTPException(status_code=404, detail="Game not found")
             
             game_state = GameManager.active_games[player_id]
-            updated_state = await self.game_service.add_memory(game_state, memory_text, memory_type)
+            updated_state = self.game_service.add_memory(game_state, memory_text, memory_type)
             GameManager.active_games[player_id] = updated_state
             
             return {
                 "message": "Memory added successfully",
-                "memories": [memory.__dict__ for memory in updated_state.memories]
+                "memories": [dump_model(memory) for memory in updated_state.memories]
             }
         except Exception as e:
             logger.error(f"Failed to add memory: {e}")
@@ -146,7 +148,7 @@ class GameManager:
                 raise HTTPException(status_code=404, detail="Game not found")
             
             game_state = GameManager.active_games[player_id]
-            updated_state = await self.game_service.update_personality(game_state, trait, value)
+            updated_state = self.game_service.update_personality(game_state, trait, value)
             GameManager.active_games[player_id] = updated_state
             
             return {
@@ -165,14 +167,7 @@ class GameManager:
             
             game_state = GameManager.active_games[player_id]
             
-            return GameResponse(
-                player_id=game_state.player.id,
-                player_name=game_state.player.name,
-                current_story=game_state.current_story.__dict__,
-                available_choices=[choice.__dict__ for choice in game_state.available_choices],
-                memories=[memory.__dict__ for memory in game_state.memories],
-                game_progress=game_state.progression.__dict__
-            )
+            return _game_response(game_state)
         except Exception as e:
             logger.error(f"Failed to get game state: {e}")
             raise HTTPException(status_code=500, detail=f"Failed to get game state: {str(e)}")
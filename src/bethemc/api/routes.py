@@ -1,7 +1,7 @@
 """
 FastAPI routes for the BeTheMC game API.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, Path
 from .game_manager import GameManager, get_game_manager
 from ..models.api import (
@@ -72,7 +72,9 @@ async def make_choice(
     game_manager: GameManager = Depends(get_game_manager)
 ):
     """Process a player's choice and advance the story."""
-    return await game_manager.make_choice(str(current_user.id), request.choice_id)
+    return await game_manager.make_choice(
+        str(current_user.id), request.choice_id, request.memories_since
+    )
 
 @router.post(
     "/game/save",
@@ -140,21 +142,24 @@ async def load_game(
     "/game/saves",
     summary="List Saves",
     description="""
-    Get a list of all saved games for the authenticated user.
+    Get the authenticated user's saved games, a page at a time.
     
     **Authentication:** Required (Bearer token)
     
-    **Returns:** List of save files with metadata
+    **Returns:** A page of save files with metadata, newest first, and a
+    `next` cursor to pass as `after_id` for the following page
     """,
-    response_description="List of saved games",
+    response_description="Page of saved games",
     tags=["Save System"]
 )
 async def get_saves(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of saves to return"),
+    after_id: Optional[str] = Query(None, description="Save id from the previous page's next cursor"),
     current_user: UserInDB = Depends(get_current_user),
     game_manager: GameManager = Depends(get_game_manager)
 ):
-    """Get all saves for the authenticated user."""
-    return await game_manager.get_saves(str(current_user.id))
+    """Get a page of saves for the authenticated user."""
+    return await game_manager.get_saves(str(current_user.id), limit, after_id)
 
 @router.post(
     "/game/memory",
@@ -17,10 +17,10 @@ class StoryMemory:
     metadata: dict    # Additional context (e.g., character names, locations)
 
 class ProgressionManager:
-    def __init__(self, config):
+    def __init__(self, config, knowledge_base: Optional[KantoKnowledgeBase] = None):
         """Initialize the progression manager."""
         self.config = config
-        self.knowledge_base = KantoKnowledgeBase(config)
+        self.knowledge_base = knowledge_base or KantoKnowledgeBase(config)
         self.scene_history: List[dict] = []
         self.max_history_length = config.get("story.max_history_length", 20)
         
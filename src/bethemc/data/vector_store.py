@@ -1,19 +1,27 @@
 """
 Vector store for Kanto knowledge and story context.
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from collections import OrderedDict
 from langchain_community.vectorstores import Qdrant
 from langchain.schema import Document
 from ..utils.config import Config
 from ..utils.logger import setup_logger
-from ..ai.providers import get_embedder_provider
+from ..ai.providers import build_embedder
 import json
+import threading
 from pathlib import Path
 from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams
+from qdrant_client.http.models import Distance, VectorParams, HnswConfigDiff, SearchParams
 
 logger = setup_logger(__name__)
 
+# Query embeddings keyed by (embedder model, normalized query), shared by
+# every knowledge base so a repeated query skips the embedder
+_EMBEDDING_CACHE_SIZE = 2048
+_embedding_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
 class KantoKnowledgeBase:
     def __init__(self, config=None):
         """Initialize the Kanto knowledge base."""
@@ -34,7 +42,8 @@ class KantoKnowledgeBase:
             print("[KantoKnowledgeBase] ERROR: Could not find 'ai.embedder' in config. Config structure:")
             pprint.pprint(self.config)
             raise ValueError("Missing 'ai.embedder' configuration in config.")
-        self.embedder = get_embedder_provider(embedder_config["provider"]).get_embedder(embedder_config)
+        self.embedder = build_embedder(embedder_config)
+        self.embedder_model = embedder_config.get("model", "")
         
         # Get vector store configuration
         vector_store_config = self.config.get("vector_store")
@@ -42,12 +51,20 @@ class KantoKnowledgeBase:
         vector_size = 384  # Default, or get from config if needed
         if "story_segments" in vector_store_config.get("collections", {}):
             vector_size = vector_store_config["collections"]["story_segments"].get("vector_size", 384)
+        # Qdrant searches through an HNSW graph; build quality and search
+        # breadth trade recall against latency
+        hnsw_config = vector_store_config.get("hnsw", {})
+        self.search_params = SearchParams(hnsw_ef=hnsw_config.get("ef_search", 100))
         client = QdrantClient(host=vector_store_config.get("host", "localhost"), port=vector_store_config.get("port", 6333))
         # Create collection if it doesn't exist
         if collection_name not in [c.name for c in client.get_collections().collections]:
             client.create_collection(
                 collection_name=collection_name,
-                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE)
+                vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE),
+                hnsw_config=HnswConfigDiff(
+                    m=hnsw_config.get("m", 16),
+                    ef_construct=hnsw_config.get("ef_construct", 128)
+                )
             )
         self.client = client
         self.collection_name = collection_name
@@ -66,9 +83,10 @@ class KantoKnowledgeBase:
     def get_location_info(self, location: str) -> Dict[str, Any]:
         """Get information about a specific location."""
         # Search for location-specific documents
-        docs = self.vector_store.similarity_search(
-            f"Information about {location} in Kanto region",
-            k=3
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(f"Information about {location} in Kanto region"),
+            k=3,
+            search_params=self.search_params
         )
         
         # Combine and format location information
@@ -100,9 +118,10 @@ class KantoKnowledgeBase:
     def get_story_context(self, query: str) -> List[Dict[str, Any]]:
         """Get relevant story context for a given query."""
         # Search for relevant documents
-        docs = self.vector_store.similarity_search(
-            query,
-            k=5
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(query),
+            k=5,
+            search_params=self.search_params
         )
         
         # Format and return context
@@ -138,10 +157,11 @@ class KantoKnowledgeBase:
 
     def get_memories_by_type(self, memory_type: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get memories by type."""
-        docs = self.vector_store.similarity_search(
-            f"memory {memory_type}",
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(f"memory {memory_type}"),
             k=limit,
-            filter={"type": "memory", "memory_type": memory_type}
+            filter={"type": "memory", "memory_type": memory_type},
+            search_params=self.search_params
         )
         
         memories = []
@@ -155,10 +175,11 @@ class KantoKnowledgeBase:
 
     def get_relevant_memories(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
         """Get memories relevant to the current context."""
-        docs = self.vector_store.similarity_search(
-            query,
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(query),
             k=limit,
-            filter={"type": "memory"}
+            filter={"type": "memory"},
+            search_params=self.search_params
         )
         
         memories = []
@@ -172,10 +193,11 @@ class KantoKnowledgeBase:
 
     def get_memories_by_character(self, character: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get memories related to a specific character."""
-        docs = self.vector_store.similarity_search(
-            f"character {character}",
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(f"character {character}"),
             k=limit,
-            filter={"type": "memory"}
+            filter={"type": "memory"},
+            search_params=self.search_params
         )
         
         memories = []
@@ -190,10 +212,11 @@ class KantoKnowledgeBase:
 
     def get_memories_by_location(self, location: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get memories related to a specific location."""
-        docs = self.vector_store.similarity_search(
-            f"location {location}",
+        docs = self.vector_store.similarity_search_by_vector(
+            self._embed_query(f"location {location}"),
             k=limit,
-            filter={"type": "memory"}
+            filter={"type": "memory"},
+            search_params=self.search_params
         )
         
         memories = []
@@ -206,6 +229,26 @@ class KantoKnowledgeBase:
         
         return memories
 
+    def _embed_query(self, query: str) -> List[float]:
+        """Embed a search query, reusing the vector of an equivalent earlier query."""
+        # Case and spacing don't change what is being asked for
+        query = " ".join(query.lower().split())
+        key = (self.embedder_model, query)
+        
+        with _embedding_cache_lock:
+            embedding = _embedding_cache.get(key)
+            if embedding is not None:
+                _embedding_cache.move_to_end(key)
+                return embedding
+        
+        embedding = self.embedder.embed_query(query)
+        
+        with _embedding_cache_lock:
+            _embedding_cache[key] = embedding
+            if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                _embedding_cache.popitem(last=False)
+        return embedding
+
     def _load_initial_knowledge(self):
         """Load initial Kanto knowledge into the vector store."""
         logger.info("Loading initial Kanto knowledge...")
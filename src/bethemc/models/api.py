@@ -124,6 +124,11 @@ class ChoiceRequest(BaseModel):
         description="Unique identifier for the chosen option",
         example="choice-1"
     )
+    memories_since: Optional[str] = Field(
+        default=None,
+        description="Id of the last memory the client has; only newer memories are returned, and an unknown id is rejected",
+        example="memory-1"
+    )
 
 class ChoiceResponse(BaseModel):
     """Response model after making a choice."""
@@ -157,7 +162,7 @@ class ChoiceResponse(BaseModel):
         ]
     )
     memories: List[Dict[str, Any]] = Field(
-        description="Updated list of player memories",
+        description="Player memories, or only those added after memories_since when given",
         example=[]
     )
     game_progress: Dict[str, Any] = Field(
@@ -1,12 +1,24 @@
 """
 Core domain models for BeTheMC.
+
+Models are frozen: every state transition builds a new instance, so
+unchanged sub-objects can be shared between successive game states. The
+game-state models compare (and hash) by identity, so checking whether a
+part changed between two states is a pointer comparison.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
+import sys
 from datetime import datetime
 from uuid import uuid4
 
-@dataclass
+# Canonical personality traits, in display order
+PERSONALITY_TRAITS = ("friendship", "courage", "curiosity", "wisdom", "determination")
+
+# Hot models are slotted where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(frozen=True)
 class PersonalityTraits:
     friendship: float
     courage: float
@@ -14,55 +26,65 @@ class PersonalityTraits:
     wisdom: float
     determination: float
 
-@dataclass
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class Player:
     id: str
     name: str
     personality_traits: Dict[str, int]
 
-@dataclass
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class Story:
     id: str
     title: str
     content: str
     location: str
 
-@dataclass
+    def __post_init__(self):
+        # Locations come from a small vocabulary; share one string per name
+        object.__setattr__(self, "location", sys.intern(self.location))
+
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class Choice:
     id: str
     text: str
     effects: Dict[str, int] = field(default_factory=dict)
 
-@dataclass
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class Memory:
     id: str
     content: str
     memory_type: str
     timestamp: datetime
 
-@dataclass
+    def __post_init__(self):
+        object.__setattr__(self, "memory_type", sys.intern(self.memory_type))
+
+@dataclass(frozen=True)
 class PersonalityTrait:
     name: str
     value: int
 
-@dataclass
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class GameProgression:
     current_location: str
-    completed_events: List[str] = field(default_factory=list)
+    completed_events: Tuple[str, ...] = ()
     relationships: Dict[str, Any] = field(default_factory=dict)
-    inventory: List[str] = field(default_factory=list)
+    inventory: Tuple[str, ...] = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "current_location", sys.intern(self.current_location))
 
-@dataclass
+@dataclass(frozen=True, eq=False, **_SLOTS)
 class GameState:
     player: Player
     current_story: Story
-    available_choices: List[Choice]
-    memories: List[Memory]
+    available_choices: Tuple[Choice, ...]
+    memories: Tuple[Memory, ...]
     progression: GameProgression
 
-@dataclass
+@dataclass(frozen=True)
 class NarrativeSegment:
     content: str
     location: str
     timestamp: datetime
-    context: Dict[str, Any] = field(default_factory=dict) 
\ No newline at end of file
+    context: Dict[str, Any] = field(default_factory=dict)
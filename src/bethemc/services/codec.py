@@ -0,0 +1,91 @@
+"""
+Game state codec for save files.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Tuple, Union
+import threading
+
+import orjson
+
+from ..models.core import GameState, Player, Story, Choice, Memory, GameProgression
+
+# Frozen models always encode to the same JSON, so recent encodings are kept.
+# Each entry holds the model itself, so its id cannot be reused while cached.
+_DUMP_CACHE_SIZE = 4096
+_dump_cache: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+# Requests run in worker threads, so cache updates are serialized
+_dump_cache_lock = threading.Lock()
+
+def encode_game_state(game_state: GameState) -> Dict[str, Any]:
+    """Get the save fields for a game state.
+
+    The models are left as dataclasses; orjson serializes them (and their
+    datetimes and tuples) natively when the save is dumped.
+    """
+    return {
+        "player": game_state.player,
+        "current_story": game_state.current_story,
+        "available_choices": game_state.available_choices,
+        "memories": game_state.memories,
+        "progression": game_state.progression
+    }
+
+def decode_game_state(data: Dict[str, Any]) -> GameState:
+    """Rebuild a game state from decoded save fields."""
+    progression = data["progression"]
+    return GameState(
+        player=Player(**data["player"]),
+        current_story=Story(**data["current_story"]),
+        available_choices=tuple(Choice(**c) for c in data["available_choices"]),
+        memories=tuple(_decode_memory(m) for m in data["memories"]),
+        progression=GameProgression(
+            current_location=progression["current_location"],
+            completed_events=tuple(progression.get("completed_events", ())),
+            relationships=progression.get("relationships", {}),
+            inventory=tuple(progression.get("inventory", ()))
+        )
+    )
+
+def _decode_memory(data: Dict[str, Any]) -> Memory:
+    """Rebuild a memory, restoring its timestamp."""
+    timestamp = data["timestamp"]
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp)
+    return Memory(
+        id=data["id"],
+        content=data["content"],
+        memory_type=data["memory_type"],
+        timestamp=timestamp
+    )
+
+def dumps(save_data: Dict[str, Any]) -> bytes:
+    """Serialize save data to indented JSON bytes."""
+    return orjson.dumps(save_data, option=orjson.OPT_INDENT_2, default=str)
+
+def loads(raw: Union[bytes, str]) -> Dict[str, Any]:
+    """Deserialize save data from JSON."""
+    return orjson.loads(raw)
+
+def dump_model(model: Any) -> Dict[str, Any]:
+    """Get the JSON form of a frozen model as a dict for API responses.
+
+    The model's JSON encoding is cached and decoded again on every call, so
+    each caller gets its own dict. Datetimes come back as ISO strings.
+    """
+    key = id(model)
+    with _dump_cache_lock:
+        entry = _dump_cache.get(key)
+        if entry is not None and entry[0] is model:
+            _dump_cache.move_to_end(key)
+            payload = entry[1]
+        else:
+            payload = None
+
+    if payload is None:
+        payload = orjson.dumps(model, default=str)
+        with _dump_cache_lock:
+            _dump_cache[key] = (model, payload)
+            if len(_dump_cache) > _DUMP_CACHE_SIZE:
+                _dump_cache.popitem(last=False)
+    return orjson.loads(payload)
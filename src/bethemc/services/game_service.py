@@ -1,20 +1,55 @@
 """
 Game service for orchestrating game logic.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, Optional, Tuple
+from types import MappingProxyType
 from datetime import datetime
-from uuid import uuid4
+import logging
+from secrets import token_hex
 
-from ..core.interfaces import (
-    StoryGenerator, KnowledgeBase, ProgressionTracker, 
-    GameState, SaveManager, PersonalityTraits, Choice, NarrativeSegment
-)
-from ..core.state import GameStateImpl
 from ..utils.logger import setup_logger
-from ..models.core import GameState, Player, Story, Choice, Memory, PersonalityTrait, GameProgression
+from ..models.core import (
+    GameState, Player, Story, Choice, Memory, GameProgression, PERSONALITY_TRAITS
+)
 
 logger = setup_logger(__name__)
 
+# Templates for the opening scene and follow-up choices, shared by every game
+_DEFAULT_PERSONALITY = MappingProxyType(dict.fromkeys(PERSONALITY_TRAITS, 5))
+_START_LOCATION = "Pallet Town"
+_WELCOME_TITLE = "Welcome to Kanto"
+_WELCOME_CONTENT = "You wake up in your room in Pallet Town, ready to begin your Pokémon adventure!"
+_INITIAL_CHOICE_SPECS = (
+    ("Visit Professor Oak's lab", {"curiosity": 1}),
+    ("Explore Pallet Town first", {"courage": 1})
+)
+_FOLLOW_UP_CHOICE_SPECS = (
+    ("Continue exploring", {"curiosity": 1}),
+    ("Take a moment to reflect", {"wisdom": 1})
+)
+
+def _choices_from_specs(specs) -> Tuple[Choice, ...]:
+    """Build fresh choices with new ids from (text, effects) templates."""
+    return tuple(
+        Choice(id=token_hex(16), text=text, effects=dict(effects))
+        for text, effects in specs
+    )
+
+def memory_cursor(memories: Tuple[Memory, ...], memory_id: Optional[str]) -> int:
+    """Get the position just after the memory with the given id.
+
+    Memories are append-only, so the search runs from the newest end and the
+    position stays valid as later memories are added. No id gives 0 (every
+    memory); an unknown id raises ValueError, since any delta for it would
+    be wrong and the client has to resync from the full game state.
+    """
+    if memory_id is None:
+        return 0
+    for index in range(len(memories) - 1, -1, -1):
+        if memories[index].id == memory_id:
+            return index + 1
+    raise ValueError(f"Unknown memory id: {memory_id}")
+
 class GameService:
     """Service for managing game logic and state."""
     
@@ -24,108 +59,37 @@ class GameService:
         # as the GameState model is self-contained
         pass
     
-    def create_session(self, session_id: str, location: str = "Pallet Town", 
-                      personality: Optional[PersonalityTraits] = None) -> GameStateImpl:
-        """Create a new game session."""
-        if personality is None:
-            personality = PersonalityTraits(
-                friendship=0.5, courage=0.5, curiosity=0.5,
-                wisdom=0.5, determination=0.5
-            )
-        
-        game_state = GameStateImpl(
-            location=location,
-            personality=personality
-        )
-        
-        logger.info(f"Created new game session: {session_id}")
-        return game_state
-    
-    def get_session(self, session_id: str) -> Optional[GameStateImpl]:
-        """Get an active game session."""
-        return None  # The new modular approach doesn't use active sessions
-    
-    def make_choice(self, session_id: str, choice_index: int) -> Optional[Dict[str, Any]]:
-        """Make a choice and progress the story."""
-        return None  # The new modular approach doesn't use session-based choices
-    
-    def get_current_state(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get the current game state."""
-        return None  # The new modular approach doesn't use session-based states
-    
-    def add_memory(self, session_id: str, memory_type: str, content: str, 
-                   location: str, metadata: Optional[Dict[str, Any]] = None) -> bool:
-        """Add a memory to the session."""
-        return False  # The new modular approach doesn't use session-based memories
-    
-    def get_compressed_context(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get compressed context for the session."""
-        return None  # The new modular approach doesn't use session-based contexts
-    
-    def save_session(self, session_id: str, save_name: str) -> bool:
-        """Save a game session."""
-        return False  # The new modular approach doesn't use session-based saves
-    
-    def load_session(self, session_id: str, save_name: str) -> Optional[GameStateImpl]:
-        """Load a game session."""
-        return None  # The new modular approach doesn't use session-based loads
-    
-    def _generate_current_narrative(self, session: GameStateImpl) -> Optional[Dict[str, Any]]:
-        """Generate current narrative and choices."""
-        return None  # The new modular approach doesn't use narrative generation
-    
-    def _generate_next_narrative(self, session: GameStateImpl) -> Optional[Dict[str, Any]]:
-        """Generate next narrative after a choice."""
-        return None  # The new modular approach doesn't use narrative generation
-
-    async def start_new_game(self, player_name: str, personality_traits: Optional[Dict[str, int]] = None) -> GameState:
+    def start_new_game(self, player_name: str, personality_traits: Optional[Dict[str, int]] = None) -> GameState:
         """Start a new game and return a modular GameState."""
         try:
             # Create player with default personality traits if none provided
             if personality_traits is None:
-                personality_traits = {
-                    "friendship": 5,
-                    "courage": 5,
-                    "curiosity": 5,
-                    "wisdom": 5,
-                    "determination": 5
-                }
+                personality_traits = dict(_DEFAULT_PERSONALITY)
             
             player = Player(
-                id=str(uuid4()),
+                id=token_hex(16),
                 name=player_name,
                 personality_traits=personality_traits
             )
             
             # Create initial story
             current_story = Story(
-                id=str(uuid4()),
-                title="Welcome to Kanto",
-                content="You wake up in your room in Pallet Town, ready to begin your Pokémon adventure!",
-                location="Pallet Town"
+                id=token_hex(16),
+                title=_WELCOME_TITLE,
+                content=_WELCOME_CONTENT,
+                location=_START_LOCATION
             )
             
             # Create initial choices
-            available_choices = [
-                Choice(
-                    id=str(uuid4()),
-                    text="Visit Professor Oak's lab",
-                    effects={"curiosity": 1}
-                ),
-                Choice(
-                    id=str(uuid4()),
-                    text="Explore Pallet Town first",
-                    effects={"courage": 1}
-                )
-            ]
+            available_choices = _choices_from_specs(_INITIAL_CHOICE_SPECS)
             
             # Initialize empty memories and progression
-            memories = []
+            memories = ()
             progression = GameProgression(
-                current_location="Pallet Town",
-                completed_events=[],
+                current_location=_START_LOCATION,
+                completed_events=(),
                 relationships={},
-                inventory=[]
+                inventory=()
             )
             
             # Create and return the game state
@@ -137,65 +101,63 @@ class GameService:
                 progression=progression
             )
             
-            logger.info(f"Started new game for player: {player_name}")
+            logger.info("Started new game for player: %s", player_name)
             return game_state
             
         except Exception as e:
             logger.error(f"Failed to start new game: {e}")
             raise
 
-    async def process_choice(self, game_state: GameState, choice_id: str) -> GameState:
+    def process_choice(self, game_state: GameState, choice_id: str) -> GameState:
         """Process a player's choice and return updated game state."""
         try:
             # Find the chosen choice
-            chosen_choice = None
-            for choice in game_state.available_choices:
-                if choice.id == choice_id:
-                    chosen_choice = choice
-                    break
+            choices_by_id = {choice.id: choice for choice in game_state.available_choices}
+            chosen_choice = choices_by_id.get(choice_id)
             
-            if not chosen_choice:
+            if chosen_choice is None:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Available choice IDs: {list(choices_by_id)}")
                 raise ValueError(f"Choice with id {choice_id} not found")
             
-            # Update personality traits based on choice effects
-            updated_personality = game_state.player.personality_traits.copy()
+            # Update personality traits based on choice effects, copying the
+            # traits only once an effect actually changes a value
+            personality = game_state.player.personality_traits
+            updated_personality = None
             for trait, effect in chosen_choice.effects.items():
-                if trait in updated_personality:
-                    updated_personality[trait] = min(10, max(0, updated_personality[trait] + effect))
-            
-            # Create updated player
-            updated_player = Player(
-                id=game_state.player.id,
-                name=game_state.player.name,
-                personality_traits=updated_personality
-            )
+                current = personality.get(trait)
+                if current is not None:
+                    value = min(10, max(0, current + effect))
+                    if value != current:
+                        if updated_personality is None:
+                            updated_personality = personality.copy()
+                        updated_personality[trait] = value
+            
+            # Players are immutable, so an unchanged player is reused as-is
+            if updated_personality is None:
+                updated_player = game_state.player
+            else:
+                updated_player = Player(
+                    id=game_state.player.id,
+                    name=game_state.player.name,
+                    personality_traits=updated_personality
+                )
             
             # Generate new story based on choice
             new_story = Story(
-                id=str(uuid4()),
+                id=token_hex(16),
                 title="Story Continues",
                 content=f"You chose: {chosen_choice.text}. The adventure continues...",
                 location=game_state.progression.current_location
             )
             
             # Generate new choices
-            new_choices = [
-                Choice(
-                    id=str(uuid4()),
-                    text="Continue exploring",
-                    effects={"curiosity": 1}
-                ),
-                Choice(
-                    id=str(uuid4()),
-                    text="Take a moment to reflect",
-                    effects={"wisdom": 1}
-                )
-            ]
+            new_choices = _choices_from_specs(_FOLLOW_UP_CHOICE_SPECS)
             
             # Update progression
             updated_progression = GameProgression(
                 current_location=game_state.progression.current_location,
-                completed_events=game_state.progression.completed_events + [chosen_choice.text],
+                completed_events=game_state.progression.completed_events + (chosen_choice.text,),
                 relationships=game_state.progression.relationships,
                 inventory=game_state.progression.inventory
             )
@@ -209,24 +171,29 @@ class GameService:
                 progression=updated_progression
             )
             
-            logger.info(f"Processed choice for player {game_state.player.name}")
+            # One lazily formatted record per turn; arguments are only
+            # rendered if the record is actually emitted
+            logger.info(
+                "Processed choice for player %s: %r (effects=%s, new_choices=%d)",
+                game_state.player.name, chosen_choice.text, chosen_choice.effects, len(new_choices)
+            )
             return updated_game_state
             
         except Exception as e:
             logger.error(f"Failed to process choice: {e}")
             raise
 
-    async def add_memory(self, game_state: GameState, memory_text: str, memory_type: str = "general") -> GameState:
+    def add_memory(self, game_state: GameState, memory_text: str, memory_type: str = "general") -> GameState:
         """Add a memory to the game state."""
         try:
             new_memory = Memory(
-                id=str(uuid4()),
+                id=token_hex(16),
                 content=memory_text,
                 memory_type=memory_type,
                 timestamp=datetime.now()
             )
             
-            updated_memories = game_state.memories + [new_memory]
+            updated_memories = game_state.memories + (new_memory,)
             
             updated_game_state = GameState(
                 player=game_state.player,
@@ -236,18 +203,24 @@ class GameService:
                 progression=game_state.progression
             )
             
-            logger.info(f"Added memory for player {game_state.player.name}")
+            logger.info("Added memory for player %s", game_state.player.name)
             return updated_game_state
             
         except Exception as e:
             logger.error(f"Failed to add memory: {e}")
             raise
 
-    async def update_personality(self, game_state: GameState, trait: str, value: int) -> GameState:
+    def update_personality(self, game_state: GameState, trait: str, value: int) -> GameState:
         """Update a player's personality trait."""
         try:
+            value = min(10, max(0, value))
+            
+            # States are immutable, so a no-op update can return the same state
+            if game_state.player.personality_traits.get(trait) == value:
+                return game_state
+            
             updated_personality = game_state.player.personality_traits.copy()
-            updated_personality[trait] = min(10, max(0, value))
+            updated_personality[trait] = value
             
             updated_player = Player(
                 id=game_state.player.id,
@@ -263,7 +236,7 @@ class GameService:
                 progression=game_state.progression
             )
             
-            logger.info(f"Updated personality trait {trait} for player {game_state.player.name}")
+            logger.info("Updated personality trait %s for player %s", trait, game_state.player.name)
             return updated_game_state
             
         except Exception as e:
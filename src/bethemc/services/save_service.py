@@ -1,20 +1,65 @@
 """
 Save/load service for game persistence with summarization support.
 """
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-import json
 from datetime import datetime
+import asyncio
+import os
+import tempfile
+import threading
 import uuid
 import gzip
 
+try:
+    import fcntl
+except ImportError:
+    # Windows locks files through msvcrt instead
+    fcntl = None
+    import msvcrt
+
 from ..core.interfaces import SaveManager
-from ..models.core import GameState, Player, Story, Choice, Memory, PersonalityTrait, GameProgression
+from ..models.core import GameState
 from ..utils.logger import get_logger
 from .summarization_service import SummarizationService
+from . import codec
 
 logger = get_logger(__name__)
 
+# Index of save listing info keyed by save id, kept next to the saves
+MANIFEST_NAME = "manifest.json"
+# Lock file held while the manifest is read or rewritten, so server
+# processes sharing a save directory don't overwrite each other's entries
+MANIFEST_LOCK_NAME = "manifest.lock"
+
+# Manifest updates are read-modify-write; serialize them across instances
+# in this process (the lock file excludes other processes, and readers only
+# take it shared)
+_manifest_lock = threading.Lock()
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Write a file through a uniquely named temp file in its directory.
+    
+    Readers never see a partial file, and concurrent writers of the same
+    path don't share a temp file.
+    """
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{path.name}.",
+                                     suffix=".tmp", delete=False) as tmp_file:
+        tmp_file.write(payload)
+    try:
+        os.replace(tmp_file.name, path)
+    except BaseException:
+        os.unlink(tmp_file.name)
+        raise
+
+# Recently loaded game states keyed by (save file, mtime). Game states are
+# frozen, so a cached state is returned as-is; rewriting the file changes
+# its mtime and misses the cache.
+_LOAD_CACHE_SIZE = 32
+_load_cache: "OrderedDict[Tuple[str, int], GameState]" = OrderedDict()
+
 class SaveService(SaveManager):
     """Service for managing game saves with automatic summarization."""
     
@@ -22,7 +67,9 @@ class SaveService(SaveManager):
                  compression_threshold_kb: int = 50):
         """Initialize the save service."""
         self.save_dir = Path(save_dir)
-        self.save_dir.mkdir(parents=True, exist_ok=True)
+        # Created on first save, off the event loop
+        self._dir_ready = False
+        self.manifest_file = self.save_dir / MANIFEST_NAME
         self.max_saves_per_player = max_saves_per_player
         self.compression_threshold_kb = compression_threshold_kb
         self.summarization_service = SummarizationService()
@@ -30,6 +77,7 @@ class SaveService(SaveManager):
     async def save_game(self, game_state: GameState, save_name: str) -> Dict[str, Any]:
         """Save game state to file with automatic optimization."""
         try:
+            await self._ensure_save_dir()
             save_id = str(uuid.uuid4())
             
             # Check if we should use summarization
@@ -46,19 +94,16 @@ class SaveService(SaveManager):
                 save_file = self.save_dir / f"{save_id}.json"
                 is_summarized = False
             
-            # Check if compression is needed
-            data_size = len(json.dumps(save_data))
-            if data_size > self.compression_threshold_kb * 1024:
-                # Use gzip compression
+            # Serialize once; the encoded size decides whether to compress
+            payload = codec.dumps(save_data)
+            is_compressed = len(payload) > self.compression_threshold_kb * 1024
+            if is_compressed:
                 save_file = save_file.with_suffix('.json.gz')
-                with gzip.open(save_file, 'wt', encoding='utf-8') as f:
-                    json.dump(save_data, f, indent=2, default=str)
-                is_compressed = True
-            else:
-                # Save as regular JSON
-                with open(save_file, 'w', encoding='utf-8') as f:
-                    json.dump(save_data, f, indent=2, default=str)
-                is_compressed = False
+            await asyncio.to_thread(self._write_save, save_file, payload, is_compressed)
+            await asyncio.to_thread(
+                self._record_save, save_file, save_data,
+                game_state.player.id, game_state.player.name
+            )
             
             # Clean up old saves for this player
             await self._cleanup_old_saves(game_state.player.id)
@@ -78,6 +123,130 @@ class SaveService(SaveManager):
             logger.error(f"Failed to save game: {e}")
             raise
     
+    async def _ensure_save_dir(self) -> None:
+        """Create the save directory once per service."""
+        if not self._dir_ready:
+            await asyncio.to_thread(self.save_dir.mkdir, parents=True, exist_ok=True)
+            self._dir_ready = True
+    
+    @staticmethod
+    def _write_save(save_file: Path, payload: bytes, compress: bool) -> None:
+        """Write an encoded save, gzip-compressed if requested."""
+        # Written atomically, so a listing never picks up a partial save
+        _atomic_write(save_file, gzip.compress(payload) if compress else payload)
+    
+    @staticmethod
+    def _read_save(save_file: Path) -> Dict[str, Any]:
+        """Read and decode a save file, compressed or not."""
+        if save_file.suffix == '.gz':
+            with gzip.open(save_file, 'rb') as f:
+                return codec.loads(f.read())
+        return codec.loads(save_file.read_bytes())
+    
+    def _find_save_file(self, save_id: str) -> Optional[Tuple[Path, int]]:
+        """Find a save file by id, with its modification time in ns."""
+        # Try different file extensions
+        possible_files = [
+            self.save_dir / f"{save_id}.json.gz",
+            self.save_dir / f"{save_id}.summary.json.gz",
+            self.save_dir / f"{save_id}.summary.json",
+            self.save_dir / f"{save_id}.json"
+        ]
+        
+        for file_path in possible_files:
+            try:
+                return file_path, file_path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+        
+        return None
+    
+    def _record_save(self, save_file: Path, save_data: Dict[str, Any],
+                     player_id: str, player_name: str) -> None:
+        """Add a newly written save to the manifest."""
+        save_info = self._make_save_info(save_file, save_data, player_id, player_name)
+        with self._manifest_locked():
+            manifest = self._load_manifest()
+            manifest[save_info["save_id"]] = save_info
+            self._write_manifest(manifest)
+    
+    @contextmanager
+    def _manifest_locked(self, shared: bool = False):
+        """Hold the manifest lock against other threads and processes.
+        
+        A shared lock lets readers run together and only waits for a
+        writer. msvcrt has no shared locks, so there every holder is
+        exclusive.
+        """
+        if shared and fcntl is not None:
+            with open(self.save_dir / MANIFEST_LOCK_NAME, 'a+b') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_SH)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+            return
+        
+        with _manifest_lock:
+            self.save_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.save_dir / MANIFEST_LOCK_NAME, 'a+b') as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    else:
+                        lock_file.seek(0)
+                        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def _decode_manifest(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Read the manifest file, or None if it is missing or unreadable."""
+        try:
+            manifest = codec.loads(self.manifest_file.read_bytes())
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            logger.warning(f"Save manifest is unreadable, rebuilding it: {e}")
+            return None
+        return manifest if isinstance(manifest, dict) else None
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the save manifest, rebuilding it if it is missing or unreadable.
+        
+        Callers must hold the exclusive manifest lock.
+        """
+        manifest = self._decode_manifest()
+        if manifest is None:
+            manifest = self._rebuild_manifest()
+        return manifest
+    
+    def _rebuild_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Rebuild the manifest from the save files on disk and write it."""
+        manifest = {}
+        for path in self.save_dir.iterdir():
+            if self._is_save_file(path):
+                save_info = self._read_save_info(path)
+                if save_info is not None:
+                    manifest[save_info["save_id"]] = save_info
+        
+        self._write_manifest(manifest)
+        logger.info(f"Rebuilt save manifest from the save directory ({len(manifest)} saves)")
+        return manifest
+    
+    def _write_manifest(self, manifest: Dict[str, Dict[str, Any]]) -> None:
+        """Atomically replace the manifest file."""
+        _atomic_write(self.manifest_file, codec.dumps(manifest))
+    
+    def _is_save_file(self, path: Path) -> bool:
+        """Check whether a path in the save directory is a save file."""
+        return (path.is_file() and path != self.manifest_file
+                and path.name.endswith(('.json', '.json.gz')))
+    
     def _create_full_save(self, game_state: GameState, save_name: str, save_id: str) -> Dict[str, Any]:
         """Create a full save with complete game state."""
         return {
@@ -85,11 +254,7 @@ class SaveService(SaveManager):
             "save_name": save_name,
             "timestamp": datetime.now().isoformat(),
             "save_type": "full",
-            "player": game_state.player.__dict__,
-            "current_story": game_state.current_story.__dict__,
-            "available_choices": [c.__dict__ for c in game_state.available_choices],
-            "memories": [m.__dict__ for m in game_state.memories],
-            "progression": game_state.progression.__dict__
+            **codec.encode_game_state(game_state)
         }
     
     def _create_summarized_save(self, game_state: GameState, save_name: str, save_id: str) -> Dict[str, Any]:
@@ -109,30 +274,20 @@ class SaveService(SaveManager):
     async def load_game(self, player_id: str, save_id: str) -> GameState:
         """Load game state from file with support for summarized saves."""
         try:
-            # Try different file extensions
-            possible_files = [
-                self.save_dir / f"{save_id}.json.gz",
-                self.save_dir / f"{save_id}.summary.json.gz",
-                self.save_dir / f"{save_id}.summary.json",
-                self.save_dir / f"{save_id}.json"
-            ]
-            
-            save_file = None
-            for file_path in possible_files:
-                if file_path.exists():
-                    save_file = file_path
-                    break
-            
-            if not save_file:
+            found = await asyncio.to_thread(self._find_save_file, save_id)
+            if found is None:
                 raise FileNotFoundError(f"Save file not found: {save_id}")
             
+            save_file, mtime = found
+            cache_key = (str(save_file), mtime)
+            cached_state = _load_cache.get(cache_key)
+            if cached_state is not None:
+                _load_cache.move_to_end(cache_key)
+                logger.info(f"Loaded cached save for player {cached_state.player.name}")
+                return cached_state
+            
             # Load the save data
-            if save_file.suffix == '.gz':
-                with gzip.open(save_file, 'rt', encoding='utf-8') as f:
-                    save_data = json.load(f)
-            else:
-                with open(save_file, 'r', encoding='utf-8') as f:
-                    save_data = json.load(f)
+            save_data = await asyncio.to_thread(self._read_save, save_file)
             
             # Reconstruct game state based on save type
             if save_data.get("save_type") == "summarized":
@@ -142,76 +297,112 @@ class SaveService(SaveManager):
                 logger.info(f"Loaded summarized save for player {game_state.player.name}")
             else:
                 # Full save reconstruction
-                game_state = self._reconstruct_full_save(save_data)
+                game_state = codec.decode_game_state(save_data)
                 logger.info(f"Loaded full save for player {game_state.player.name}")
             
+            _load_cache[cache_key] = game_state
+            if len(_load_cache) > _LOAD_CACHE_SIZE:
+                _load_cache.popitem(last=False)
+            
             return game_state
         except Exception as e:
             logger.error(f"Failed to load game: {e}")
             raise
     
-    def _reconstruct_full_save(self, save_data: Dict[str, Any]) -> GameState:
-        """Reconstruct game state from full save data."""
-        player = Player(**save_data["player"])
-        current_story = Story(**save_data["current_story"])
-        available_choices = [Choice(**c) for c in save_data["available_choices"]]
-        memories = [Memory(**m) for m in save_data["memories"]]
-        progression = GameProgression(**save_data["progression"])
-        
-        return GameState(
-            player=player,
-            current_story=current_story,
-            available_choices=available_choices,
-            memories=memories,
-            progression=progression
-        )
-    
     async def get_player_saves(self, player_id: str) -> List[Dict[str, Any]]:
         """Get all saves for a player with optimization info."""
         try:
-            saves = []
-            for save_file in self.save_dir.glob("*"):
-                if not save_file.is_file():
-                    continue
-                
-                try:
-                    # Load save metadata
-                    if save_file.suffix == '.gz':
-                        with gzip.open(save_file, 'rt', encoding='utf-8') as f:
-                            save_data = json.load(f)
-                    else:
-                        with open(save_file, 'r', encoding='utf-8') as f:
-                            save_data = json.load(f)
-                    
-                    if save_data.get("player", {}).get("id") == player_id:
-                        save_info = {
-                            "save_id": save_data["save_id"],
-                            "save_name": save_data["save_name"],
-                            "timestamp": save_data["timestamp"],
-                            "player_name": save_data.get("player", {}).get("name", "Unknown"),
-                            "save_type": save_data.get("save_type", "full"),
-                            "is_compressed": save_file.suffix == '.gz',
-                            "file_size_kb": save_file.stat().st_size / 1024
-                        }
-                        
-                        # Add optimization info for summarized saves
-                        if save_data.get("save_type") == "summarized":
-                            save_info.update({
-                                "original_memory_count": save_data.get("original_memory_count", 0),
-                                "current_memory_count": len(save_data.get("summarized_state", {}).get("key_memories", [])),
-                                "compression_ratio": save_data.get("original_memory_count", 0) / max(1, len(save_data.get("summarized_state", {}).get("key_memories", [])))
-                            })
-                        
-                        saves.append(save_info)
-                except Exception as e:
-                    logger.warning(f"Failed to read save file {save_file}: {e}")
-                    continue
+            manifest = await asyncio.to_thread(self._read_manifest)
+            saves = [save_info for save_info in manifest.values()
+                     if save_info["player_id"] == player_id]
             
             return sorted(saves, key=lambda x: x["timestamp"], reverse=True)
         except Exception as e:
             logger.error(f"Failed to get saves for player {player_id}: {e}")
             raise
     
+    async def get_player_saves_page(self, player_id: str, limit: int = 20,
+                                    after_id: Optional[str] = None) -> Dict[str, Any]:
+        """Get a page of a player's saves, newest first.
+        
+        after_id is the last save id of the previous page; "next" is the
+        cursor for the following page, or None on the last page. A cursor
+        for a save that no longer exists raises ValueError, so a client
+        following cursors never silently restarts from the newest save.
+        """
+        saves = await self.get_player_saves(player_id)
+        start = 0
+        if after_id is not None:
+            start = next(
+                (index + 1 for index, save in enumerate(saves) if save["save_id"] == after_id),
+                None
+            )
+            if start is None:
+                raise ValueError(f"Unknown save cursor: {after_id}")
+        page = saves[start:start + limit]
+        next_id = page[-1]["save_id"] if start + limit < len(saves) else None
+        return {"saves": page, "next": next_id}
+    
+    def _read_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the save manifest for listing."""
+        if not self.save_dir.exists():
+            # Nothing has been saved yet; don't create the directory to list it
+            return {}
+        with self._manifest_locked(shared=True):
+            manifest = self._decode_manifest()
+        if manifest is not None:
+            return manifest
+        
+        # Rebuilding writes the manifest, which needs the exclusive lock
+        with self._manifest_locked():
+            return self._load_manifest()
+    
+    def _read_save_info(self, save_file: Path) -> Optional[Dict[str, Any]]:
+        """Get the listing info for an existing save file."""
+        try:
+            save_data = self._read_save(save_file)
+            
+            if save_data.get("save_type") == "summarized":
+                summarized_state = save_data.get("summarized_state", {})
+                player_id = summarized_state.get("player_id")
+                player_name = summarized_state.get("player_name", "Unknown")
+            else:
+                player_id = save_data.get("player", {}).get("id")
+                player_name = save_data.get("player", {}).get("name", "Unknown")
+            
+            if player_id is None:
+                return None
+            return self._make_save_info(save_file, save_data, player_id, player_name)
+        except Exception as e:
+            logger.warning(f"Failed to read save file {save_file}: {e}")
+            return None
+    
+    @staticmethod
+    def _make_save_info(save_file: Path, save_data: Dict[str, Any],
+                        player_id: str, player_name: str) -> Dict[str, Any]:
+        """Build the manifest entry for a save."""
+        save_info = {
+            "save_id": save_data["save_id"],
+            "save_name": save_data["save_name"],
+            "timestamp": save_data["timestamp"],
+            "player_id": player_id,
+            "player_name": player_name,
+            "save_type": save_data.get("save_type", "full"),
+            "is_compressed": save_file.suffix == '.gz',
+            "file_size_kb": save_file.stat().st_size / 1024
+        }
+        
+        # Add optimization info for summarized saves
+        if save_data.get("save_type") == "summarized":
+            key_memory_count = len(save_data.get("summarized_state", {}).get("key_memories", []))
+            save_info.update({
+                "original_memory_count": save_data.get("original_memory_count", 0),
+                "current_memory_count": key_memory_count,
+                "compression_ratio": save_data.get("original_memory_count", 0) / max(1, key_memory_count)
+            })
+        
+        return save_info
+    
     async def _cleanup_old_saves(self, player_id: str) -> None:
         """Clean up old saves for a player, keeping only the most recent ones."""
         try:
@@ -219,47 +410,56 @@ class SaveService(SaveManager):
             if len(saves) > self.max_saves_per_player:
                 saves_to_delete = saves[self.max_saves_per_player:]
                 for save in saves_to_delete:
-                    self.delete_save(save["save_id"])
+                    await self.delete_save(save["save_id"])
                 logger.info(f"Cleaned up {len(saves_to_delete)} old saves for player {player_id}")
         except Exception as e:
             logger.error(f"Failed to cleanup old saves for player {player_id}: {e}")
     
-    def delete_save(self, save_id: str) -> bool:
+    async def delete_save(self, save_id: str) -> bool:
         """Delete a save file."""
         try:
-            # Try different file extensions
-            possible_files = [
-                self.save_dir / f"{save_id}.json.gz",
-                self.save_dir / f"{save_id}.summary.json.gz",
-                self.save_dir / f"{save_id}.summary.json",
-                self.save_dir / f"{save_id}.json"
-            ]
-            
-            for file_path in possible_files:
-                if file_path.exists():
-                    file_path.unlink()
-                    logger.info(f"Deleted save file: {save_id}")
-                    return True
-            
-            return False
+            deleted = await asyncio.to_thread(self._delete_save_file, save_id)
+            if deleted:
+                logger.info(f"Deleted save file: {save_id}")
+            return deleted
         except Exception as e:
             logger.error(f"Failed to delete save {save_id}: {e}")
             return False
     
+    def _delete_save_file(self, save_id: str) -> bool:
+        """Remove a save file and its manifest entry.
+        
+        The entry is dropped even if the file is already gone, so a save
+        removed out of band leaves the listing once it is deleted.
+        """
+        found = self._find_save_file(save_id)
+        if found is not None:
+            # Another process may have removed it since it was found
+            found[0].unlink(missing_ok=True)
+        if not self.save_dir.exists():
+            return False
+        
+        with self._manifest_locked():
+            manifest = self._load_manifest()
+            had_entry = manifest.pop(save_id, None) is not None
+            if had_entry:
+                self._write_manifest(manifest)
+        return found is not None or had_entry
+    
     def get_save_stats(self) -> Dict[str, Any]:
         """Get statistics about all saves."""
         try:
-            saves = list(self.save_dir.glob("*"))
-            file_sizes = [f.stat().st_size for f in saves if f.is_file()]
+            saves = [f for f in self.save_dir.glob("*") if self._is_save_file(f)]
+            file_sizes = [f.stat().st_size for f in saves]
             
             total_size_mb = sum(file_sizes) / (1024 * 1024) if file_sizes else 0
             average_size_kb = sum(file_sizes) / len(file_sizes) / 1024 if file_sizes else 0
             largest_save_kb = max(file_sizes) / 1024 if file_sizes else 0
             
             # Count by type
-            full_saves = len([f for f in saves if f.is_file() and f.suffix == '.json' and not f.stem.endswith('.summary')])
-            summarized_saves = len([f for f in saves if f.is_file() and 'summary' in f.name])
-            compressed_saves = len([f for f in saves if f.is_file() and f.suffix == '.gz'])
+            full_saves = len([f for f in saves if f.suffix == '.json' and not f.stem.endswith('.summary')])
+            summarized_saves = len([f for f in saves if 'summary' in f.name])
+            compressed_saves = len([f for f in saves if f.suffix == '.gz'])
             
             return {
                 "total_saves": len(saves),
@@ -4,9 +4,10 @@ Summarization service for optimizing large save states and game contexts.
 from typing import Dict, List, Any, Optional, Tuple
 import json
 from datetime import datetime
-from dataclasses import asdict
 import hashlib
 
+import orjson
+
 from ..models.core import GameState, Player, Story, Choice, Memory, GameProgression
 from ..utils.logger import get_logger
 
@@ -172,14 +173,14 @@ class SummarizationService:
             )
             
             # Reconstruct choices
-            available_choices = [
+            available_choices = tuple(
                 Choice(
                     id=choice["id"],
                     text=choice["text"],
                     effects=choice["effects"]
                 )
                 for choice in summarized_state["available_choices"]
-            ]
+            )
             
             # Reconstruct memories (limited)
             memories = []
@@ -195,16 +196,16 @@ class SummarizationService:
             # Reconstruct progression (with limited data)
             progression = GameProgression(
                 current_location=summarized_state["current_location"],
-                completed_events=summarized_state["compressed_progression"]["recent_events"],
+                completed_events=tuple(summarized_state["compressed_progression"]["recent_events"]),
                 relationships={},  # Lost in compression
-                inventory=[]  # Lost in compression
+                inventory=()  # Lost in compression
             )
             
             game_state = GameState(
                 player=player,
                 current_story=current_story,
                 available_choices=available_choices,
-                memories=memories,
+                memories=tuple(memories),
                 progression=progression
             )
             
@@ -298,12 +299,13 @@ class SummarizationService:
     def get_save_size_estimate(self, game_state: GameState) -> Dict[str, Any]:
         """Estimate the size of a save file and provide optimization suggestions."""
         try:
-            # Calculate component sizes
-            player_size = len(json.dumps(asdict(game_state.player)))
-            story_size = len(json.dumps(asdict(game_state.current_story)))
-            choices_size = len(json.dumps([asdict(c) for c in game_state.available_choices]))
-            memories_size = len(json.dumps([asdict(m) for m in game_state.memories]))
-            progression_size = len(json.dumps(asdict(game_state.progression)))
+            # Calculate component sizes (orjson encodes the dataclasses and
+            # their datetimes directly)
+            player_size = len(orjson.dumps(game_state.player))
+            story_size = len(orjson.dumps(game_state.current_story))
+            choices_size = len(orjson.dumps(game_state.available_choices))
+            memories_size = len(orjson.dumps(game_state.memories))
+            progression_size = len(orjson.dumps(game_state.progression))
             
             total_size = player_size + story_size + choices_size + memories_size + progression_size
             
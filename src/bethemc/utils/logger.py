@@ -1,40 +1,68 @@
 """
 Logging setup for the game.
 """
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
+
+LOG_FILE = Path(__file__).resolve().parents[3] / "logs" / "game.log"
+
+@lru_cache(maxsize=None)
+def _default_level() -> str:
+    """Get the configured log level, reading the config only once."""
+    from .config import Config
+    return Config().get("logging.level", "INFO")
+
+@lru_cache(maxsize=None)
+def _shared_handlers() -> Tuple[logging.Handler, ...]:
+    """Create the handlers shared by every logger.
+    
+    Loggers only enqueue records; a listener thread writes them to the
+    console and file, so a log call never blocks the event loop on I/O.
+    """
+    log_format = logging.Formatter(
+        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    console_handler = logging.StreamHandler(sys.stdout)
+    # The file itself is only opened when the first record is written
+    LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(LOG_FILE, delay=True)
+    console_handler.setFormatter(log_format)
+    file_handler.setFormatter(log_format)
+    
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, console_handler, file_handler)
+    listener.start()
+    # Stopping drains the queue, so records logged just before exit are kept
+    atexit.register(listener.stop)
+    return (logging.handlers.QueueHandler(log_queue),)
 
 def setup_logger(name: str, level: Optional[str] = None) -> logging.Logger:
     """Set up a logger with the specified name and level."""
     logger = logging.getLogger(name)
     
+    # Already set up by an earlier call; adding handlers again would
+    # duplicate every record
+    if logger.handlers:
+        return logger
+    
     # Set level from config if not specified
     if level is None:
-        from .config import Config
-        config = Config()
-        level = config.get("logging.level", "INFO")
+        level = _default_level()
     
     logger.setLevel(getattr(logging, level.upper()))
     
-    # Create handlers
-    console_handler = logging.StreamHandler(sys.stdout)
-    file_handler = logging.FileHandler(
-        Path(__file__).parent.parent.parent.parent / "logs" / "game.log"
-    )
-    
-    # Create formatters and add it to handlers
-    log_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    console_handler.setFormatter(log_format)
-    file_handler.setFormatter(log_format)
+    for handler in _shared_handlers():
+        logger.addHandler(handler)
     
-    # Add handlers to the logger
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # The handlers write directly; don't emit again through the root logger
+    logger.propagate = False
     
     return logger
 
-get_logger = setup_logger 
\ No newline at end of file
+get_logger = setup_logger
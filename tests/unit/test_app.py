@@ -0,0 +1,34 @@
+"""
+Tests for the API application's middleware.
+"""
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi.testclient import TestClient
+
+from bethemc.api.app import create_app
+
+def test_preflight_to_an_authenticated_route_is_answered_by_cors():
+    client = TestClient(create_app())
+
+    response = client.options(
+        "/api/v1/game/choice",
+        headers={
+            "Origin": "https://example.com",
+            "Access-Control-Request-Method": "POST",
+            "Access-Control-Request-Headers": "Authorization, Content-Type"
+        }
+    )
+
+    assert response.status_code == 200
+    assert response.headers["Access-Control-Max-Age"] == "86400"
+
+def test_unauthenticated_response_carries_cors_headers():
+    client = TestClient(create_app())
+
+    response = client.post("/api/v1/game/choice", headers={"Origin": "https://example.com"})
+
+    assert response.status_code == 401
+    assert "Access-Control-Allow-Origin" in response.headers
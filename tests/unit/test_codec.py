@@ -0,0 +1,54 @@
+"""
+Tests for the game state codec.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+from bethemc.services import codec
+from bethemc.services.game_service import GameService
+
+def _game_state():
+    """Build a game state with a memory and a completed choice."""
+    service = GameService()
+    game_state = service.start_new_game("Ash")
+    game_state = service.add_memory(game_state, "Met Pikachu", "friendship")
+    return service.process_choice(game_state, game_state.available_choices[0].id)
+
+def test_game_state_round_trips_through_save_encoding():
+    game_state = _game_state()
+
+    raw = codec.dumps(codec.encode_game_state(game_state))
+    decoded = codec.decode_game_state(codec.loads(raw))
+
+    assert asdict(decoded) == asdict(game_state)
+
+def test_dump_model_matches_the_model_fields():
+    game_state = _game_state()
+    memory = game_state.memories[0]
+
+    data = codec.dump_model(memory)
+
+    assert data == {**asdict(memory), "timestamp": memory.timestamp.isoformat()}
+    assert codec.dump_model(game_state.progression) == {
+        "current_location": game_state.progression.current_location,
+        "completed_events": list(game_state.progression.completed_events),
+        "relationships": game_state.progression.relationships,
+        "inventory": list(game_state.progression.inventory)
+    }
+
+def test_dump_model_returns_a_fresh_dict_on_every_call():
+    choice = _game_state().available_choices[0]
+
+    first = codec.dump_model(choice)
+    first["text"] = "changed"
+    first["effects"]["courage"] = 100
+
+    assert codec.dump_model(choice) == asdict(choice)
+
+def test_dump_model_is_consistent_across_threads():
+    models = [choice for _ in range(50) for choice in _game_state().available_choices]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        dumped = list(pool.map(codec.dump_model, models * 4))
+
+    assert dumped == [asdict(model) for model in models * 4]
@@ -0,0 +1,42 @@
+"""
+Tests for the game service.
+"""
+import pytest
+
+from bethemc.services.game_service import GameService, memory_cursor
+
+def _game_with_memories(count: int):
+    """Start a game and add count memories to it."""
+    service = GameService()
+    game_state = service.start_new_game("Ash")
+    for index in range(count):
+        game_state = service.add_memory(game_state, f"Memory {index}", "general")
+    return game_state
+
+def test_memory_cursor_without_id_includes_every_memory():
+    memories = _game_with_memories(3).memories
+
+    assert memories[memory_cursor(memories, None):] == memories
+
+def test_memory_cursor_gives_only_newer_memories():
+    memories = _game_with_memories(3).memories
+
+    newer = memories[memory_cursor(memories, memories[0].id):]
+
+    assert [memory.content for memory in newer] == ["Memory 1", "Memory 2"]
+    assert memories[memory_cursor(memories, memories[-1].id):] == ()
+
+def test_memory_cursor_stays_valid_as_memories_are_added():
+    service = GameService()
+    game_state = _game_with_memories(2)
+    cursor = memory_cursor(game_state.memories, game_state.memories[-1].id)
+
+    game_state = service.add_memory(game_state, "Memory 2", "general")
+
+    assert [memory.content for memory in game_state.memories[cursor:]] == ["Memory 2"]
+
+def test_memory_cursor_rejects_an_unknown_id():
+    memories = _game_with_memories(3).memories
+
+    with pytest.raises(ValueError):
+        memory_cursor(memories, "missing")
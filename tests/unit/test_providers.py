@@ -0,0 +1,55 @@
+"""
+Tests for the shared LLM and embedder builders.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("langchain")
+
+from bethemc.ai import providers
+
+def test_build_llm_accepts_nested_config_values(monkeypatch):
+    built = []
+
+    class FakeProvider(providers.LLMProvider):
+        def get_llm(self, config):
+            built.append(config)
+            return object()
+
+    monkeypatch.setitem(providers._LLM_PROVIDERS, "fake", FakeProvider())
+    config = {"provider": "fake", "stop": ["\n\n"], "model_kwargs": {"top_p": 0.9}}
+
+    first = providers.build_llm(config)
+    second = providers.build_llm(dict(reversed(list(config.items()))))
+
+    assert first is second
+    # The provider receives the config as given, not its frozen key
+    assert built == [config]
+
+def test_slow_build_does_not_block_other_configs(monkeypatch):
+    release = threading.Event()
+
+    class SlowProvider(providers.LLMProvider):
+        def get_llm(self, config):
+            # Stands in for a model preload that takes a while
+            release.wait(timeout=10)
+            return object()
+
+    class FastProvider(providers.LLMProvider):
+        def get_llm(self, config):
+            return object()
+
+    monkeypatch.setitem(providers._LLM_PROVIDERS, "slow", SlowProvider())
+    monkeypatch.setitem(providers._LLM_PROVIDERS, "fast", FastProvider())
+    slow_build = threading.Thread(target=providers.build_llm, args=({"provider": "slow"},))
+    slow_build.start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            fast_build = pool.submit(providers.build_llm, {"provider": "fast"})
+            assert fast_build.result(timeout=2) is not None
+    finally:
+        release.set()
+        slow_build.join()
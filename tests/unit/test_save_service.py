@@ -0,0 +1,130 @@
+"""
+Tests for the save manifest and save listing of SaveService.
+"""
+import asyncio
+import multiprocessing
+
+import pytest
+
+from bethemc.services import codec
+from bethemc.services.game_service import GameService
+from bethemc.services.save_service import SaveService
+
+def _save_games(save_dir: str, count: int) -> None:
+    """Save a fresh game count times; run in a separate process."""
+    service = SaveService(save_dir, max_saves_per_player=100)
+    game_state = GameService().start_new_game("Ash")
+    for index in range(count):
+        asyncio.run(service.save_game(game_state, f"save {index}"))
+
+def test_saves_are_listed_newest_first(tmp_path):
+    service = SaveService(str(tmp_path))
+    game_state = GameService().start_new_game("Ash")
+    first = asyncio.run(service.save_game(game_state, "first"))
+    second = asyncio.run(service.save_game(game_state, "second"))
+
+    saves = asyncio.run(service.get_player_saves(game_state.player.id))
+
+    assert [save["save_id"] for save in saves] == [second["save_id"], first["save_id"]]
+
+def test_listing_without_saves_does_not_create_the_directory(tmp_path):
+    save_dir = tmp_path / "saves"
+    service = SaveService(str(save_dir))
+
+    assert asyncio.run(service.get_player_saves("nobody")) == []
+    assert not save_dir.exists()
+
+def test_listing_reads_the_manifest_without_scanning_the_directory(tmp_path, monkeypatch):
+    service = SaveService(str(tmp_path))
+    game_state = GameService().start_new_game("Ash")
+    saved = asyncio.run(service.save_game(game_state, "first"))
+
+    def fail_rebuild():
+        raise AssertionError("the manifest was rebuilt")
+    monkeypatch.setattr(service, "_rebuild_manifest", fail_rebuild)
+
+    saves = asyncio.run(service.get_player_saves(game_state.player.id))
+    assert [save["save_id"] for save in saves] == [saved["save_id"]]
+
+def test_missing_manifest_is_rebuilt_from_the_save_files(tmp_path):
+    service = SaveService(str(tmp_path))
+    game_state = GameService().start_new_game("Ash")
+    saved = asyncio.run(service.save_game(game_state, "kept"))
+
+    service.manifest_file.unlink()
+
+    saves = asyncio.run(service.get_player_saves(game_state.player.id))
+    assert [save["save_id"] for save in saves] == [saved["save_id"]]
+    assert saved["save_id"] in codec.loads(service.manifest_file.read_bytes())
+
+def test_corrupt_manifest_is_rebuilt_when_saving(tmp_path):
+    service = SaveService(str(tmp_path))
+    game_state = GameService().start_new_game("Ash")
+    first = asyncio.run(service.save_game(game_state, "first"))
+
+    service.manifest_file.write_bytes(b"{not json")
+    second = asyncio.run(service.save_game(game_state, "second"))
+
+    saves = asyncio.run(service.get_player_saves(game_state.player.id))
+    assert [save["save_id"] for save in saves] == [second["save_id"], first["save_id"]]
+
+def test_deleting_a_save_whose_file_is_gone_drops_its_entry(tmp_path):
+    service = SaveService(str(tmp_path))
+    game_state = GameService().start_new_game("Ash")
+    saved = asyncio.run(service.save_game(game_state, "removed"))
+
+    for save_file in tmp_path.glob(f"{saved['save_id']}.*"):
+        save_file.unlink()
+
+    assert asyncio.run(service.delete_save(saved["save_id"]))
+    assert asyncio.run(service.get_player_saves(game_state.player.id)) == []
+
+def test_concurrent_processes_keep_every_save(tmp_path):
+    processes, saves_per_process = 4, 5
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_save_games, args=(str(tmp_path), saves_per_process))
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    manifest = codec.loads((tmp_path / "manifest.json").read_bytes())
+    save_files = [path for path in tmp_path.iterdir() if path.name.endswith((".json", ".json.gz"))
+                  and path.name != "manifest.json"]
+    assert len(manifest) == len(save_files) == processes * saves_per_process
+    assert not list(tmp_path.glob("*.tmp"))
+
+def _saved_ids(service: SaveService, count: int):
+    """Save a game count times; get the player id and save ids, newest first."""
+    game_state = GameService().start_new_game("Ash")
+    save_ids = [asyncio.run(service.save_game(game_state, f"save {index}"))["save_id"]
+                for index in range(count)]
+    return game_state.player.id, save_ids[::-1]
+
+def test_save_pages_follow_the_cursor_to_the_end(tmp_path):
+    service = SaveService(str(tmp_path), max_saves_per_player=100)
+    player_id, save_ids = _saved_ids(service, 5)
+
+    seen, after_id = [], None
+    while True:
+        page = asyncio.run(service.get_player_saves_page(player_id, limit=2, after_id=after_id))
+        seen.extend(save["save_id"] for save in page["saves"])
+        after_id = page["next"]
+        if after_id is None:
+            break
+
+    assert seen == save_ids
+
+def test_save_page_rejects_a_deleted_cursor(tmp_path):
+    service = SaveService(str(tmp_path), max_saves_per_player=100)
+    player_id, save_ids = _saved_ids(service, 3)
+    page = asyncio.run(service.get_player_saves_page(player_id, limit=1))
+
+    asyncio.run(service.delete_save(page["next"]))
+
+    with pytest.raises(ValueError):
+        asyncio.run(service.get_player_saves_page(player_id, limit=1, after_id=page["next"]))